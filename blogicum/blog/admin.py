@@ -1,7 +1,8 @@
 from django.contrib import admin
 
-from .mixins import AdminZoneShortNamesMixin
+from .mixins import AdminZoneShortNamesMixin, FullTextSearchAdminMixin
 from .models import Category, Comment, Location, Post
+from .search import COMMENT_SEARCH_INDEX, POST_SEARCH_INDEX
 
 
 @admin.register(Category)
@@ -11,9 +12,15 @@ class CategoryAdmin(AdminZoneShortNamesMixin, admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(AdminZoneShortNamesMixin, admin.ModelAdmin):
+class CommentAdmin(
+    FullTextSearchAdminMixin, AdminZoneShortNamesMixin, admin.ModelAdmin
+):
     list_display = ('author', 'post', 'short_text')
-    search_fields = ('post__title',)
+    search_fields = ('text', 'post__title')
+    search_indexes = (
+        ('pk', COMMENT_SEARCH_INDEX),
+        ('post', POST_SEARCH_INDEX),
+    )
 
 
 @admin.register(Location)
@@ -22,8 +29,11 @@ class LocationAdmin(AdminZoneShortNamesMixin, admin.ModelAdmin):
 
 
 @admin.register(Post)
-class PostAdmin(AdminZoneShortNamesMixin, admin.ModelAdmin):
+class PostAdmin(
+    FullTextSearchAdminMixin, AdminZoneShortNamesMixin, admin.ModelAdmin
+):
     list_display = ('short_title', 'is_published', 'category')
     list_editable = ('is_published', 'category')
     list_filter = ('category',)
-    search_fields = ('title',)
+    search_fields = ('title', 'text')
+    search_indexes = (('pk', POST_SEARCH_INDEX),)
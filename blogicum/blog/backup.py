@@ -0,0 +1,269 @@
+import json
+import time
+import zlib
+from collections import Counter
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .constants import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_GZIP_BUFFER_SIZE,
+    IMPORT_BATCH_SIZE,
+    IMPORT_READ_SIZE,
+    USER
+)
+from .feed import due_post_ids, refresh_feed_entries
+from .models import Category, Comment, Location, Post
+from .page_cache import invalidate_pages
+from .pagination import invalidate_feed_counts
+from .search import COMMENT_SEARCH_INDEX, POST_SEARCH_INDEX
+from .sync import record_changes
+
+BACKUP_MODELS = {
+    'category': Category,
+    'location': Location,
+    'post': Post,
+    'comment': Comment,
+}
+
+DEFAULT_EXPORT_MODELS = ('post', 'comment')
+
+
+def export_records(model_names=DEFAULT_EXPORT_MODELS,
+                   chunk_size=EXPORT_CHUNK_SIZE):
+    serializer = serializers.get_serializer('python')()
+    for name in model_names:
+        model = BACKUP_MODELS[name]
+        queryset = model._default_manager.order_by('pk')
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield serializer.serialize([obj])[0]
+
+
+def export_lines(model_names=DEFAULT_EXPORT_MODELS,
+                 chunk_size=EXPORT_CHUNK_SIZE):
+    for record in export_records(model_names, chunk_size):
+        yield json.dumps(
+            record, cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+
+def gzip_stream(lines, buffer_size=EXPORT_GZIP_BUFFER_SIZE):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    buffer = []
+    buffered = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= buffer_size:
+            chunk = compressor.compress(b''.join(buffer))
+            buffer, buffered = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b''.join(buffer)) + compressor.flush()
+
+
+IMPORT_MODELS = {
+    'auth.user': USER,
+    'blog.category': Category,
+    'blog.location': Location,
+    'blog.post': Post,
+    'blog.comment': Comment,
+}
+
+SYNCED_IMPORT_MODELS = {
+    Category: 'category',
+    Location: 'location',
+    Post: 'post',
+    Comment: 'comment',
+}
+
+SEARCH_INDEXES = {
+    Post: POST_SEARCH_INDEX,
+    Comment: COMMENT_SEARCH_INDEX,
+}
+
+
+class InvalidFixture(Exception):
+    pass
+
+
+def iter_json_array(file, first_chunk, read_size=IMPORT_READ_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = first_chunk[first_chunk.index('[') + 1:]
+    position = 0
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            if position == len(buffer):
+                raise ValueError
+            value, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise InvalidFixture('Файл оборван или повреждён.')
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield value
+
+
+def iter_ndjson(file, first_chunk, read_size=IMPORT_READ_SIZE):
+    pending = first_chunk
+    while True:
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = file.read(read_size)
+        if not chunk:
+            break
+        pending += chunk
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def iter_fixture_records(file, read_size=IMPORT_READ_SIZE):
+    first_chunk = file.read(read_size)
+    if first_chunk.lstrip().startswith('['):
+        return iter_json_array(file, first_chunk, read_size)
+    return iter_ndjson(file, first_chunk, read_size)
+
+
+class BlogImporter:
+
+    def __init__(self, using='default', batch_size=IMPORT_BATCH_SIZE):
+        self.using = using
+        self.batch_size = batch_size
+        self.pending = {}
+        self.imported = Counter()
+        self.skipped = Counter()
+        self.feeds = set()
+        self.post_ids = set()
+        self.category_ids = set()
+
+    def add(self, record):
+        label = record.get('model', '').lower()
+        if label not in IMPORT_MODELS:
+            self.skipped[label] += 1
+            return
+        batch = self.pending.setdefault(label, [])
+        batch.append(record)
+        if len(batch) >= self.batch_size:
+            self.flush(label)
+
+    def flush(self, label):
+        records = self.pending.pop(label, [])
+        if not records:
+            return
+        model = IMPORT_MODELS[label]
+        objects = list(serializers.deserialize(
+            'python', records, using=self.using, ignorenonexistent=True
+        ))
+        self.insert(model, [obj.object for obj in objects])
+        self.save_m2m(model, objects)
+        pks = [obj.object.pk for obj in objects]
+        if model in SYNCED_IMPORT_MODELS:
+            record_changes(SYNCED_IMPORT_MODELS[model], pks)
+        if model in SEARCH_INDEXES:
+            SEARCH_INDEXES[model].refresh(pks, self.using)
+        if model is Post:
+            self.post_ids.update(pks)
+            self.feeds.update(
+                (obj.object.author_id, obj.object.category_id)
+                for obj in objects
+            )
+        elif model is Comment:
+            self.post_ids.update(obj.object.post_id for obj in objects)
+        elif model is Category:
+            self.category_ids.update(pks)
+        self.imported[label] += len(objects)
+
+    def insert(self, model, objects):
+        fields = model._meta.concrete_fields
+        batch_size = min(
+            self.batch_size,
+            connections[self.using].ops.bulk_batch_size(fields, objects)
+        )
+        for start in range(0, len(objects), batch_size):
+            model._base_manager._insert(
+                objects[start:start + batch_size],
+                fields=fields,
+                using=self.using,
+                raw=True
+            )
+
+    def save_m2m(self, model, objects):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            through._default_manager.using(self.using).bulk_create(
+                through(**{source: obj.object.pk, target: value})
+                for obj in objects
+                for value in obj.m2m_data.get(field.name, ())
+            )
+
+    def derive_post_fields(self):
+        now = timezone.now()
+        comment_counts = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(count=Count('pk')).values('count')
+        )
+        post_ids = sorted(self.post_ids)
+        for start in range(0, len(post_ids), self.batch_size):
+            Post._base_manager.using(self.using).filter(
+                pk__in=post_ids[start:start + self.batch_size]
+            ).update(
+                is_live=Case(
+                    When(pub_date__lte=now, then=Value(True)),
+                    default=Value(False)
+                ),
+                comment_count=Coalesce(Subquery(comment_counts), 0)
+            )
+
+    def finish(self):
+        for label in IMPORT_MODELS:
+            self.flush(label)
+        connection = connections[self.using]
+        models = [IMPORT_MODELS[label] for label in self.imported]
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models]
+        )
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+        self.derive_post_fields()
+        refresh_feed_entries(sorted(self.post_ids))
+        refresh_feed_entries(
+            due_post_ids().filter(category_id__in=self.category_ids)
+        )
+        for author_id, category_id in self.feeds:
+            invalidate_feed_counts(author_id, category_id)
+        invalidate_pages('feed', *(f'post:{pk}' for pk in self.post_ids))
+
+
+def import_records(records, using='default', batch_size=IMPORT_BATCH_SIZE):
+    importer = BlogImporter(using, batch_size)
+    started = time.monotonic()
+    with transaction.atomic(using=using):
+        with connections[using].constraint_checks_disabled():
+            for record in records:
+                importer.add(record)
+            importer.finish()
+    importer.elapsed = time.monotonic() - started
+    return importer
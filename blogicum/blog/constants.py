@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 
 
@@ -5,6 +7,50 @@ MAX_TITLE_LENGTH = 256
 
 POSTS_PER_PAGE = 10
 
+COMMENTS_PER_PAGE = 20
+
+API_POSTS_PER_PAGE = 100
+
+SYNC_BATCH_SIZE = 500
+
+SYNC_MAX_EVENTS = 5000
+
+SYNC_SAFETY_LAG = timedelta(seconds=5)
+
+FEED_COUNT_CACHE_TIMEOUT = 60 * 5
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+PAGE_RANGE_ON_EACH_SIDE = 2
+
+PAGE_RANGE_ON_ENDS = 1
+
 TITLE_DISPLAY_LIMIT = 15
 
+FEED_EXCERPT_WORDS = 10
+
+SEARCH_SNIPPET_WORDS = 16
+
+SEARCH_REFRESH_CHUNK = 500
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_GZIP_BUFFER_SIZE = 64 * 1024
+
+IMPORT_BATCH_SIZE = 1000
+
+IMPORT_READ_SIZE = 64 * 1024
+
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+
+IMAGE_VARIANT_QUALITY = 80
+
+IMAGE_TASK_MAX_ATTEMPTS = 5
+
+IMAGE_TASK_RETRY_DELAY = 60
+
+IMAGE_TASK_LEASE = 60 * 10
+
 USER = get_user_model()
@@ -0,0 +1,73 @@
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import FeedEntry, Post
+
+FEED_REFRESH_CHUNK = 500
+
+
+def visible_posts():
+    return Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        is_live=True
+    )
+
+
+def refresh_feed_entries(post_ids):
+    post_ids = iter(post_ids)
+    while True:
+        chunk = list(islice(post_ids, FEED_REFRESH_CHUNK))
+        if not chunk:
+            return
+        posts = visible_posts().filter(pk__in=chunk).select_related(
+            'author', 'category', 'location', 'image_info'
+        )
+        with transaction.atomic():
+            FeedEntry.objects.filter(post_id__in=chunk).delete()
+            FeedEntry.objects.bulk_create(
+                FeedEntry.from_post(post) for post in posts
+            )
+
+
+def shift_comment_count(post_id, delta):
+    FeedEntry.objects.filter(post_id=post_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def due_post_ids():
+    return visible_posts().filter(
+        feed_entry__isnull=True
+    ).values_list('pk', flat=True)
+
+
+def rebuild_feed():
+    FeedEntry.objects.all().delete()
+    refresh_feed_entries(visible_posts().values_list('pk', flat=True))
+
+
+def refresh_category(category):
+    entries = FeedEntry.objects.filter(category_id=category.pk)
+    if not category.is_published:
+        entries.delete()
+        return
+    entries.update(category_slug=category.slug, category_title=category.title)
+    refresh_feed_entries(due_post_ids().filter(category_id=category.pk))
+
+
+def refresh_location(location):
+    FeedEntry.objects.filter(location_id=location.pk).update(
+        location_name=location.name,
+        location_is_published=location.is_published
+    )
+
+
+def refresh_author(user, add_due=False):
+    if add_due:
+        refresh_feed_entries(due_post_ids().filter(author_id=user.pk))
+    FeedEntry.objects.filter(author_id=user.pk).exclude(
+        author_username=user.username
+    ).update(author_username=user.username)
@@ -0,0 +1,239 @@
+import hashlib
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .constants import (
+    IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_QUALITY, IMAGE_VARIANT_WIDTHS
+)
+from .models import Post, PostImage
+from .page_cache import invalidate_pages
+
+VARIANTS_DIR = 'thumbs'
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+EXIF_ORIENTATION = 0x0112
+
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+JPEG_METADATA_PREFIXES = (b'Exif\x00\x00', b'http://ns.adobe.com/xap/1.0/\x00')
+
+LOSSLESS_SAVE_OPTIONS = {'WEBP': {'lossless': True}}
+
+
+def variant_name(name, width, image_format):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, VARIANTS_DIR,
+        f'{stem}_{width}w.{EXTENSIONS[image_format]}'
+    )
+
+
+def variant_widths(width):
+    return [w for w in IMAGE_VARIANT_WIDTHS if w < width] or [width]
+
+
+def encode_variant(image, width, image_format):
+    height = max(round(image.height * width / image.width), 1)
+    resized = image.resize((width, height), Image.LANCZOS)
+    if image_format == 'jpeg' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+    buffer = BytesIO()
+    resized.save(
+        buffer, image_format.upper(),
+        quality=IMAGE_VARIANT_QUALITY, optimize=True
+    )
+    return buffer.getvalue()
+
+
+def generate_variants(image_file, storage=default_storage):
+    with image_file.open('rb') as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+    variants = []
+    for width in variant_widths(image.width):
+        for image_format in IMAGE_VARIANT_FORMATS:
+            name = variant_name(image_file.name, width, image_format)
+            storage.delete(name)
+            name = storage.save(
+                name,
+                ContentFile(encode_variant(image, width, image_format))
+            )
+            variants.append(
+                {'width': width, 'format': image_format, 'name': name}
+            )
+    return variants
+
+
+def delete_variants(variants, storage=default_storage):
+    for variant in variants:
+        storage.delete(variant['name'])
+
+
+def srcset(variants, image_format, storage=default_storage):
+    return ', '.join(
+        f'{storage.url(variant["name"])} {variant["width"]}w'
+        for variant in variants
+        if variant['format'] == image_format
+    )
+
+
+def orientation_segment(orientation):
+    if orientation in (None, 1):
+        return b''
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    payload = exif.tobytes()
+    return b'\xff\xe1' + (len(payload) + 2).to_bytes(2, 'big') + payload
+
+
+def strip_jpeg_metadata(data, orientation):
+    if not data.startswith(b'\xff\xd8'):
+        return None
+    output = [data[:2]]
+    position = 2
+    replaced = False
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in (0xDA, 0xD9):
+            break
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            output.append(data[position:position + 2])
+            position += 2
+            continue
+        end = position + 2 + int.from_bytes(
+            data[position + 2:position + 4], 'big'
+        )
+        segment = data[position:end]
+        if marker == 0xE1 and segment[4:].startswith(JPEG_METADATA_PREFIXES):
+            if not replaced:
+                output.append(orientation_segment(orientation))
+                replaced = True
+        else:
+            output.append(segment)
+        position = end
+    output.append(data[position:])
+    return b''.join(output)
+
+
+def strip_metadata(image_file, storage=default_storage):
+    with image_file.open('rb') as file:
+        data = file.read()
+    with Image.open(BytesIO(data)) as image:
+        exif = image.getexif()
+        if set(exif) <= {EXIF_ORIENTATION}:
+            return
+        cleaned = None
+        if image.format == 'JPEG':
+            cleaned = strip_jpeg_metadata(data, exif.get(EXIF_ORIENTATION))
+        if cleaned is None:
+            buffer = BytesIO()
+            ImageOps.exif_transpose(image).save(
+                buffer, image.format,
+                **LOSSLESS_SAVE_OPTIONS.get(image.format, {})
+            )
+            cleaned = buffer.getvalue()
+    storage.delete(image_file.name)
+    storage.save(image_file.name, ContentFile(cleaned))
+
+
+def read_file_metadata(file):
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+    return {
+        'width': width,
+        'height': height,
+        'size': size,
+        'sha256': digest.hexdigest(),
+    }
+
+
+def read_metadata(image_file):
+    if image_file._committed:
+        with image_file.storage.open(image_file.name, 'rb') as file:
+            return read_file_metadata(file)
+    file = image_file.file
+    file.seek(0)
+    try:
+        return read_file_metadata(file)
+    finally:
+        file.seek(0)
+
+
+def find_duplicate(sha256, storage=default_storage):
+    for source in PostImage.objects.filter(sha256=sha256).values_list(
+        'source', flat=True
+    ):
+        if storage.exists(source):
+            return source
+    return None
+
+
+def release_variants(image_info):
+    shared = PostImage.objects.filter(source=image_info.source).exclude(
+        pk=image_info.pk
+    ).exists()
+    if not shared:
+        delete_variants(image_info.variants)
+
+
+def save_image_metadata(post, metadata):
+    image_info = PostImage.objects.filter(post=post).first()
+    if image_info is not None and image_info.source != post.image.name:
+        release_variants(image_info)
+    PostImage.objects.update_or_create(post=post, defaults={
+        'source': post.image.name,
+        'variants': [],
+        **metadata,
+    })
+
+
+def shared_variants(post):
+    for variants in (
+        PostImage.objects.filter(source=post.image.name)
+        .exclude(post=post)
+        .values_list('variants', flat=True)
+    ):
+        if variants:
+            return variants
+    return None
+
+
+def process_post_image(post):
+    if not post.image:
+        PostImage.objects.filter(post=post).delete()
+        return
+    strip_metadata(post.image)
+    metadata = read_metadata(post.image)
+    image_info = PostImage.objects.filter(post=post).first()
+    if image_info is not None and image_info.sha256:
+        metadata['sha256'] = image_info.sha256
+    PostImage.objects.update_or_create(post=post, defaults={
+        'source': post.image.name,
+        'variants': shared_variants(post) or generate_variants(post.image),
+        **metadata,
+    })
+    Post.objects.filter(pk=post.pk, image=post.image.name).update(
+        image_status='ready'
+    )
+    invalidate_pages(f'post:{post.pk}')
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import refresh_feed_entries
+from blog.images import read_metadata, save_image_metadata
+from blog.models import Post, PostImage
+from blog.page_cache import invalidate_pages
+from blog.tasks import enqueue_image_task
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет размеры, вес и хеш изображений публикаций, '
+        'загруженных до появления этих полей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать данные для всех изображений.'
+        )
+
+    def handle(self, *args, all=False, **options):
+        posts = Post.objects.exclude(image='').select_related('image_info')
+        updated = []
+        for post in posts.iterator():
+            image_info = post.image_metadata
+            if not all and image_info is not None and image_info.sha256:
+                continue
+            try:
+                metadata = read_metadata(post.image)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Публикация {post.pk}: {error}')
+                continue
+            if image_info is None:
+                save_image_metadata(post, metadata)
+                Post.objects.filter(pk=post.pk).update(
+                    image_status='pending'
+                )
+                enqueue_image_task(post.pk)
+            else:
+                PostImage.objects.filter(pk=image_info.pk).update(**metadata)
+            invalidate_pages(f'post:{post.pk}')
+            updated.append(post.pk)
+        refresh_feed_entries(updated)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено изображений: {len(updated)}'
+        ))
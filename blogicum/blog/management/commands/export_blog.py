@@ -0,0 +1,60 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand
+
+from blog.backup import BACKUP_MODELS, DEFAULT_EXPORT_MODELS, export_lines
+from blog.constants import EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает публикации и комментарии в формате NDJSON, '
+        'не загружая таблицы в память целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-m', '--models',
+            nargs='+',
+            choices=tuple(BACKUP_MODELS),
+            default=DEFAULT_EXPORT_MODELS,
+            help='Модели для выгрузки (по умолчанию post и comment).'
+        )
+        parser.add_argument(
+            '-o', '--output',
+            default='-',
+            help='Файл для записи, «-» — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжать выгрузку gzip.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за один запрос.'
+        )
+
+    def open_output(self, output, compress):
+        if output == '-':
+            if compress:
+                return gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8')
+            return self.stdout
+        if compress:
+            return gzip.open(output, 'wt', encoding='utf-8')
+        return open(output, 'w', encoding='utf-8')
+
+    def handle(self, *args, models, output, chunk_size, **options):
+        stream = self.open_output(output, options['gzip'])
+        count = 0
+        try:
+            for line in export_lines(models, chunk_size):
+                stream.write(line)
+                count += 1
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+        self.stderr.write(f'Выгружено записей: {count}')
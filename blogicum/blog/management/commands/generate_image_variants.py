@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import process_post_image
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений публикаций, '
+        'у которых их ещё нет.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать уменьшенные копии для всех изображений.'
+        )
+
+    def handle(self, *args, all=False, **options):
+        posts = Post.objects.exclude(image='').select_related('image_info')
+        processed = 0
+        for post in posts.iterator():
+            if not all and post.image_variants:
+                continue
+            process_post_image(post)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {processed}'
+        ))
@@ -0,0 +1,60 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from blog.backup import InvalidFixture, import_records, iter_fixture_records
+from blog.constants import IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает пользователей, категории, местоположения, '
+        'публикации и комментарии из фикстуры JSON или NDJSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixture',
+            help='Путь к файлу (.json, .ndjson, можно .gz), «-» — stdin.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Сколько строк одной модели вставлять за раз.'
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='База данных для загрузки.'
+        )
+
+    def open_fixture(self, path):
+        if path == '-':
+            return sys.stdin
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8')
+        return open(path, encoding='utf-8')
+
+    def handle(self, *args, fixture, batch_size, database, **options):
+        try:
+            with self.open_fixture(fixture) as file:
+                importer = import_records(
+                    iter_fixture_records(file), database, batch_size
+                )
+        except OSError as error:
+            raise CommandError(f'Не удалось прочитать {fixture}: {error}')
+        except (InvalidFixture, ValueError, DatabaseError) as error:
+            raise CommandError(f'Ошибка загрузки {fixture}: {error}')
+        total = sum(importer.imported.values())
+        for label, count in importer.imported.items():
+            self.stdout.write(f'{label}: {count}')
+        for label, count in importer.skipped.items():
+            self.stdout.write(f'{label or "?"}: пропущено {count}')
+        elapsed = max(importer.elapsed, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {total} за {elapsed:.2f} с '
+            f'({total / elapsed:.0f} строк/с)'
+        ))
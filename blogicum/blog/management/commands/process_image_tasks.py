@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.tasks import process_image_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает очередь изображений: создаёт уменьшенные копии '
+        'и удаляет EXIF из загруженных файлов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help=(
+                'Работать постоянно, проверяя очередь раз в N секунд '
+                '(0 — обработать очередь один раз).'
+            )
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Обработать не больше N задач за проход.'
+        )
+
+    def process(self, limit):
+        processed, failed = process_image_tasks(limit)
+        if processed or failed:
+            self.stdout.write(
+                f'Обработано: {processed}, с ошибкой: {failed}'
+            )
+
+    def handle(self, *args, interval=0, limit=None, **options):
+        self.process(limit)
+        while interval:
+            time.sleep(interval)
+            self.process(limit)
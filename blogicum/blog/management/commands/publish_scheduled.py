@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import publish_due_posts, seconds_until_next_publication
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные посты, время которых наступило, '
+        'и сбрасывает связанные кэши.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help=(
+                'Работать постоянно, проверяя не реже чем раз в N секунд '
+                '(0 — выполнить один раз).'
+            )
+        )
+
+    def publish_due(self):
+        published, postponed = publish_due_posts()
+        if published or postponed:
+            self.stdout.write(
+                f'Опубликовано: {published}, отложено: {postponed}'
+            )
+
+    def handle(self, *args, interval=0, **options):
+        self.publish_due()
+        while interval:
+            delay = seconds_until_next_publication()
+            time.sleep(interval if delay is None else min(interval, delay))
+            self.publish_due()
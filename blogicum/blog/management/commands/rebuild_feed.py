@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.feed import rebuild_feed
+from blog.models import FeedEntry
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает таблицу ленты главной страницы.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_feed()
+        self.stdout.write(self.style.SUCCESS(
+            f'Записей в ленте: {FeedEntry.objects.count()}'
+        ))
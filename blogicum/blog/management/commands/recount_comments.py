@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, не исправляя их.'
+        )
+
+    def handle(self, *args, dry_run=False, **options):
+        drifted = (
+            Post.objects
+            .annotate(actual_count=Count('comments'))
+            .exclude(comment_count=F('actual_count'))
+            .values_list('pk', 'comment_count', 'actual_count')
+        )
+        fixed = 0
+        with transaction.atomic():
+            for post_id, stored, actual in drifted:
+                self.stdout.write(
+                    f'Публикация {post_id}: {stored} -> {actual}'
+                )
+                if not dry_run:
+                    Post.objects.filter(pk=post_id).update(
+                        comment_count=actual
+                    )
+                fixed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Расхождений найдено: {fixed}'
+        ))
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import IMPORT_BATCH_SIZE, USER
+from blog.models import Category
+from blog.seed import BlogSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями, '
+        'местоположениями, публикациями и комментариями.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 100),
+            ('categories', 10),
+            ('locations', 20),
+            ('posts', 1000),
+            ('comments', 5000),
+        ):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Сколько записей создать (по умолчанию {default}).'
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Зерно генератора для воспроизводимых данных.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Сколько строк вставлять за раз.'
+        )
+
+    def handle(self, *args, seed, batch_size, **volumes):
+        if volumes['posts'] and not (
+            (volumes['users'] or USER.objects.exists())
+            and (volumes['categories'] or Category.objects.exists())
+        ):
+            raise CommandError(
+                'Для публикаций нужны хотя бы один пользователь '
+                'и одна категория.'
+            )
+        started = time.monotonic()
+        results = BlogSeeder(seed).seed(
+            users=volumes['users'],
+            categories=volumes['categories'],
+            locations=volumes['locations'],
+            posts=volumes['posts'],
+            comments=volumes['comments'],
+            batch_size=batch_size,
+        )
+        elapsed = max(time.monotonic() - started, 1e-6)
+        total = 0
+        for result in results:
+            for label, count in result.imported.items():
+                self.stdout.write(f'{label}: {count}')
+                total += count
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано записей: {total} за {elapsed:.2f} с '
+            f'({total / elapsed:.0f} строк/с)'
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:44
+
+from django.db import migrations, models
+
+
+def journal_existing_rows(apps, schema_editor):
+    ChangeEvent = apps.get_model('blog', 'ChangeEvent')
+    for model_name in ('category', 'location', 'post', 'comment'):
+        model = apps.get_model('blog', model_name)
+        ChangeEvent.objects.bulk_create(
+            ChangeEvent(model_name=model_name, object_id=pk)
+            for pk in model.objects.values_list('pk', flat=True).iterator()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(choices=[('post', 'Публикация'), ('comment', 'Комментарий'), ('category', 'Категория'), ('location', 'Местоположение')], max_length=16, verbose_name='Модель')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Удалён')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='Изменено')),
+            ],
+            options={
+                'verbose_name': 'изменение',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.RunPython(journal_existing_rows, migrations.RunPython.noop),
+    ]
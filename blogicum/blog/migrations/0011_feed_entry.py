@@ -0,0 +1,79 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+from django.utils.text import Truncator
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now()
+    ).select_related('author', 'category', 'location')
+    FeedEntry.objects.bulk_create(
+        FeedEntry(
+            post_id=post.pk,
+            pub_date=post.pub_date,
+            title=post.title,
+            excerpt=Truncator(post.text).words(10),
+            image=post.image.name or '',
+            comment_count=post.comment_count,
+            author_id=post.author_id,
+            author_username=post.author.username,
+            category_id=post.category_id,
+            category_slug=post.category.slug,
+            category_title=post.category.title,
+            location_id=post.location_id,
+            location_name=post.location.name if post.location else '',
+            location_is_published=bool(
+                post.location and post.location.is_published
+            ),
+        )
+        for post in posts.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0010_change_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post')),
+                ('pub_date', models.DateTimeField()),
+                ('title', models.CharField(max_length=256)),
+                ('excerpt', models.TextField()),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('author_username', models.CharField(max_length=150)),
+                ('category_slug', models.SlugField()),
+                ('category_title', models.CharField(max_length=256)),
+                ('location_name', models.CharField(blank=True, max_length=256)),
+                ('location_is_published', models.BooleanField(default=False)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='blog.category')),
+                ('location', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='feed_entries', to='blog.location')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date', '-post_id'),
+                'default_related_name': 'feed_entries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='feed_entry_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
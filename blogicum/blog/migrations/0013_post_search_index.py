@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:51
+
+from django.db import migrations
+
+CREATE_SQL = {
+    'sqlite': (
+        'CREATE VIRTUAL TABLE "blog_post_fts" USING fts5("title", "text", '
+        "tokenize = 'unicode61 remove_diacritics 2')",
+        'INSERT INTO "blog_post_fts" (rowid, "title", "text") '
+        'SELECT "id", "title", "text" FROM "blog_post"',
+    ),
+    'postgresql': (
+        'CREATE INDEX "post_search_idx" ON "blog_post" USING gin (('
+        "setweight(to_tsvector('russian'::regconfig, "
+        "COALESCE((\"title\")::text, '')), 'A') || "
+        "setweight(to_tsvector('russian'::regconfig, "
+        "COALESCE((\"text\")::text, '')), 'B')))",
+    ),
+}
+
+DROP_SQL = {
+    'sqlite': ('DROP TABLE "blog_post_fts"',),
+    'postgresql': ('DROP INDEX IF EXISTS "post_search_idx"',),
+}
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_is_live'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
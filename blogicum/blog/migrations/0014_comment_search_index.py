@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:52
+
+from django.db import migrations
+
+CREATE_SQL = {
+    'sqlite': (
+        'CREATE VIRTUAL TABLE "blog_comment_fts" USING fts5("text", '
+        "tokenize = 'unicode61 remove_diacritics 2')",
+        'INSERT INTO "blog_comment_fts" (rowid, "text") '
+        'SELECT "id", "text" FROM "blog_comment"',
+    ),
+    'postgresql': (
+        'CREATE INDEX "comment_search_idx" ON "blog_comment" USING gin (('
+        "setweight(to_tsvector('russian'::regconfig, "
+        "COALESCE((\"text\")::text, '')), 'A')))",
+    ),
+}
+
+DROP_SQL = {
+    'sqlite': ('DROP TABLE "blog_comment_fts"',),
+    'postgresql': ('DROP INDEX IF EXISTS "comment_search_idx"',),
+}
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
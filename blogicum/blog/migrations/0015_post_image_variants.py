@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_comment_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostImage',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='image_info', serialize=False, to='blog.post', verbose_name='Пост')),
+                ('source', models.CharField(max_length=100, verbose_name='Исходный файл')),
+                ('variants', models.JSONField(default=list, verbose_name='Уменьшенные копии')),
+            ],
+            options={
+                'verbose_name': 'изображение публикации',
+                'verbose_name_plural': 'Изображения публикаций',
+            },
+        ),
+        migrations.AddField(
+            model_name='feedentry',
+            name='image_variants',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:56
+
+from django.db import migrations, models
+from django.db.models import F
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def fill_image_status(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    ImageTask = apps.get_model('blog', 'ImageTask')
+    posts = Post.objects.exclude(image='')
+    posts.filter(image_info__source=F('image')).update(image_status='ready')
+    pending = posts.exclude(image_status='ready')
+    pending.update(image_status='pending')
+    ImageTask.objects.bulk_create(
+        ImageTask(post_id=post_id)
+        for post_id in pending.values_list('pk', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Обрабатывается'), ('ready', 'Готово'), ('failed', 'Ошибка обработки')], editable=False, max_length=16, verbose_name='Обработка изображения'),
+        ),
+        migrations.CreateModel(
+            name='ImageTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, null=True, verbose_name='Выполнить после')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занята обработчиком до')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='image_task', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'задача обработки изображения',
+                'verbose_name_plural': 'Очередь обработки изображений',
+                'ordering': ('run_after', 'id'),
+            },
+        ),
+        migrations.RunPython(fill_image_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='imagetask',
+            index=models.Index(condition=models.Q(('run_after__isnull', False)), fields=['run_after'], name='image_task_due_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_image_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedentry',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feedentry',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Высота'),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='SHA-256 загруженного файла'),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Размер файла, байт'),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Ширина'),
+        ),
+    ]
@@ -1,13 +1,21 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Count
+from django.db.models import Q
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils import timezone
 from django.utils.text import Truncator
 
-from .constants import TITLE_DISPLAY_LIMIT
+from .constants import COMMENTS_PER_PAGE, TITLE_DISPLAY_LIMIT
 from .models import Post
+from .page_cache import (
+    count_request, get_cached_page, page_cache_key, post_tags, store_page
+)
+from .pagination import CachedCountPaginator, CursorPaginator
+from core.metrics import track_render
 
 
 class PostsQuerySetMixin:
@@ -15,21 +23,109 @@ class PostsQuerySetMixin:
     def get_base_queryset(self):
         return (
             Post.objects
-            .annotate(comment_count=Count('comments'))
             .order_by('-pub_date')
-            .select_related('author', 'category', 'location')
+            .select_related('author', 'category', 'location', 'image_info')
+        )
+
+    def get_published_filter(self):
+        return Q(
+            category__is_published=True,
+            is_published=True,
+            is_live=True
         )
 
+    def get_visible_filter(self):
+        visible = self.get_published_filter()
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return visible
+
     def get_filtered_queryset(self):
         qs = self.get_base_queryset()
+        return qs.filter(self.get_published_filter())
+
+
+class CursorPaginationMixin:
+    cursor_pagination = None
+    paginator_template = 'includes/paginator.html'
+    cursor_paginator_template = 'includes/cursor_paginator.html'
+
+    def uses_cursor_pagination(self):
+        if self.cursor_pagination is None:
+            return settings.BLOG_CURSOR_PAGINATION
+        return self.cursor_pagination
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        page = paginator.get_page_or_404(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['paginator_template'] = (
+            self.cursor_paginator_template if self.uses_cursor_pagination()
+            else self.paginator_template
+        )
+        return context
+
+
+class CachedCountMixin:
+    paginator_class = CachedCountPaginator
+
+    def get_count_cache_key(self):
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, cache_key=self.get_count_cache_key(), **kwargs
+        )
+
+
+class AnonymousPageCacheMixin:
+    page_cache_tags = ()
+
+    def is_page_cacheable(self):
         return (
-            qs.filter(
-                category__is_published=True,
-                is_published=True,
-                pub_date__lte=timezone.localtime()
-            )
+            settings.BLOG_PAGE_CACHE
+            and self.request.method == 'GET'
+            and not self.request.user.is_authenticated
         )
 
+    def get_page_cache_tags(self, context):
+        if 'page_obj' in context:
+            posts = context['page_obj']
+        else:
+            posts = (context['object'],)
+        tags = set(self.page_cache_tags)
+        for post in posts:
+            tags.update(post_tags(
+                post.pk, post.author_id, post.category_id, post.location_id
+            ))
+        return sorted(tags)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable():
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = get_cached_page(key)
+        if response is not None:
+            count_request('hits')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+        count_request('misses')
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            track_render(response)
+            if not response.cookies:
+                store_page(
+                    key, response,
+                    self.get_page_cache_tags(response.context_data)
+                )
+        response['X-Page-Cache'] = 'MISS'
+        return response
+
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
@@ -41,6 +137,20 @@ class OnlyAuthorMixin(UserPassesTestMixin):
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
 
+class FullTextSearchAdminMixin:
+    search_indexes = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(reduce(or_, (
+            Q(**{f'{lookup}__in': index.matching(
+                index.model.objects.values('pk'), search_term
+            )})
+            for lookup, index in self.search_indexes
+        ))), False
+
+
 class AdminZoneShortNamesMixin:
 
     @admin.display(description='Заголовок')
@@ -56,6 +166,19 @@ class AdminZoneShortNamesMixin:
         return Truncator(obj.name).chars(TITLE_DISPLAY_LIMIT)
 
 
+class CommentsPaginationMixin:
+    comments_per_page = COMMENTS_PER_PAGE
+
+    def get_comments_page(self, post):
+        paginator = CursorPaginator(
+            post.comments.select_related('author'),
+            self.comments_per_page,
+            field='created_at',
+            descending=False
+        )
+        return paginator.get_page_or_404(self.request.GET.get('comments'))
+
+
 class CommentSuccessUrlMixin:
 
     def get_success_url(self):
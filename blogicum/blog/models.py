@@ -1,11 +1,14 @@
+from datetime import datetime
+
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.utils import timezone
 from django.utils.text import Truncator
 
 from .constants import (
-    MAX_TITLE_LENGTH, TITLE_DISPLAY_LIMIT, USER
+    FEED_EXCERPT_WORDS, MAX_TITLE_LENGTH, TITLE_DISPLAY_LIMIT, USER
 )
-from core.models import PublishableTimestampedModel
+from core.models import PublishableQuerySet, PublishableTimestampedModel
 
 
 class Category(PublishableTimestampedModel):
@@ -44,7 +47,22 @@ class Location(PublishableTimestampedModel):
         return Truncator(self.name).chars(TITLE_DISPLAY_LIMIT)
 
 
+class PostQuerySet(PublishableQuerySet):
+
+    def update(self, **kwargs):
+        pub_date = kwargs.get('pub_date')
+        if isinstance(pub_date, datetime) and 'is_live' not in kwargs:
+            kwargs['is_live'] = pub_date <= timezone.now()
+        return super().update(**kwargs)
+
+
 class Post(PublishableTimestampedModel):
+    IMAGE_STATUS_CHOICES = (
+        ('pending', 'Обрабатывается'),
+        ('ready', 'Готово'),
+        ('failed', 'Ошибка обработки'),
+    )
+
     title = models.CharField(
         max_length=MAX_TITLE_LENGTH,
         verbose_name='Заголовок'
@@ -79,16 +97,77 @@ class Post(PublishableTimestampedModel):
         upload_to='blog_images',
         blank=True
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    is_live = models.BooleanField(
+        'Время публикации наступило',
+        default=False,
+        editable=False
+    )
+    image_status = models.CharField(
+        'Обработка изображения',
+        max_length=16,
+        choices=IMAGE_STATUS_CHOICES,
+        blank=True,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True, is_live=True),
+                name='post_live_feed_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_live=False),
+                name='post_scheduled_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return Truncator(self.title).chars(TITLE_DISPLAY_LIMIT)
 
+    @property
+    def image_metadata(self):
+        try:
+            image_info = self.image_info
+        except ObjectDoesNotExist:
+            return None
+        if not self.image or image_info.source != self.image.name:
+            return None
+        return image_info
+
+    @property
+    def image_variants(self):
+        image_info = self.image_metadata
+        if image_info is None or self.image_status != 'ready':
+            return []
+        return image_info.variants
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is not None:
+            update_fields = {*update_fields, 'is_live'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -109,6 +188,218 @@ class Comment(models.Model):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return Truncator(self.text).chars(TITLE_DISPLAY_LIMIT)
+
+
+class PostImage(models.Model):
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='image_info'
+    )
+    source = models.CharField('Исходный файл', max_length=100)
+    variants = models.JSONField('Уменьшенные копии', default=list)
+    width = models.PositiveIntegerField('Ширина', blank=True, null=True)
+    height = models.PositiveIntegerField('Высота', blank=True, null=True)
+    size = models.PositiveBigIntegerField(
+        'Размер файла, байт', blank=True, null=True
+    )
+    sha256 = models.CharField(
+        'SHA-256 загруженного файла', max_length=64, blank=True, db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'изображение публикации'
+        verbose_name_plural = 'Изображения публикаций'
+
+    def __str__(self):
+        return self.source
+
+
+class ImageTask(models.Model):
+    post = models.OneToOneField(
+        Post,
+        verbose_name='Пост',
+        on_delete=models.CASCADE,
+        related_name='image_task'
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    run_after = models.DateTimeField(
+        'Выполнить после', default=timezone.now, null=True
+    )
+    locked_until = models.DateTimeField(
+        'Занята обработчиком до', blank=True, null=True
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'задача обработки изображения'
+        verbose_name_plural = 'Очередь обработки изображений'
+        ordering = ('run_after', 'id')
+        indexes = (
+            models.Index(
+                fields=('run_after',),
+                condition=models.Q(run_after__isnull=False),
+                name='image_task_due_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.attempts}'
+
+
+class ChangeEvent(models.Model):
+    MODEL_CHOICES = (
+        ('post', 'Публикация'),
+        ('comment', 'Комментарий'),
+        ('category', 'Категория'),
+        ('location', 'Местоположение'),
+    )
+
+    model_name = models.CharField(
+        'Модель', max_length=16, choices=MODEL_CHOICES
+    )
+    object_id = models.PositiveBigIntegerField('ID объекта')
+    deleted = models.BooleanField('Удалён', default=False)
+    changed_at = models.DateTimeField('Изменено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'{self.model_name}:{self.object_id}'
+
+
+class FeedPostIterable(models.query.ModelIterable):
+
+    def __iter__(self):
+        for entry in super().__iter__():
+            yield entry.as_post()
+
+
+class FeedEntryQuerySet(models.QuerySet):
+
+    def as_posts(self):
+        clone = self._chain()
+        clone._iterable_class = FeedPostIterable
+        return clone
+
+
+class FeedEntry(models.Model):
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='feed_entry'
+    )
+    pub_date = models.DateTimeField()
+    title = models.CharField(max_length=MAX_TITLE_LENGTH)
+    excerpt = models.TextField()
+    image = models.CharField(max_length=100, blank=True)
+    image_variants = models.JSONField(default=list)
+    image_width = models.PositiveIntegerField(blank=True, null=True)
+    image_height = models.PositiveIntegerField(blank=True, null=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    author = models.ForeignKey(USER, on_delete=models.CASCADE)
+    author_username = models.CharField(max_length=150)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    category_slug = models.SlugField()
+    category_title = models.CharField(max_length=MAX_TITLE_LENGTH)
+    location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, blank=True, null=True
+    )
+    location_name = models.CharField(max_length=MAX_TITLE_LENGTH, blank=True)
+    location_is_published = models.BooleanField(default=False)
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        default_related_name = 'feed_entries'
+        ordering = ('-pub_date', '-post_id')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-post'),
+                name='feed_entry_pub_date_idx'
+            ),
+        )
+
+    def __str__(self):
+        return Truncator(self.title).chars(TITLE_DISPLAY_LIMIT)
+
+    @classmethod
+    def from_post(cls, post):
+        location = post.location
+        image_info = post.image_metadata
+        return cls(
+            post_id=post.pk,
+            pub_date=post.pub_date,
+            title=post.title,
+            excerpt=Truncator(post.text).words(FEED_EXCERPT_WORDS),
+            image=post.image.name or '',
+            image_variants=post.image_variants,
+            image_width=image_info.width if image_info else None,
+            image_height=image_info.height if image_info else None,
+            comment_count=post.comment_count,
+            author_id=post.author_id,
+            author_username=post.author.username,
+            category_id=post.category_id,
+            category_slug=post.category.slug,
+            category_title=post.category.title,
+            location_id=post.location_id,
+            location_name=location.name if location else '',
+            location_is_published=bool(location and location.is_published),
+        )
+
+    def as_post(self):
+        author = USER(pk=self.author_id, username=self.author_username)
+        category = Category(
+            pk=self.category_id,
+            slug=self.category_slug,
+            title=self.category_title,
+            is_published=True
+        )
+        location = None
+        if self.location_id is not None:
+            location = Location(
+                pk=self.location_id,
+                name=self.location_name,
+                is_published=self.location_is_published
+            )
+        post = Post(
+            pk=self.post_id,
+            title=self.title,
+            text=self.excerpt,
+            pub_date=self.pub_date,
+            image=self.image,
+            image_status='ready' if self.image_variants else '',
+            comment_count=self.comment_count,
+            is_published=True,
+            author=author,
+            category=category,
+            location=location
+        )
+        post.image_info = PostImage(
+            source=self.image,
+            variants=self.image_variants,
+            width=self.image_width,
+            height=self.image_height
+        )
+        for obj in (post, author, category, location, post.image_info):
+            if obj is not None:
+                obj._state.adding = False
+                obj._state.db = self._state.db
+        return post
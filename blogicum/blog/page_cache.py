@@ -0,0 +1,128 @@
+import hashlib
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+
+from .constants import PAGE_CACHE_TIMEOUT
+from .pagination import invalidate_feed_counts
+
+STATS_KEYS = {
+    'hits': 'blog:page_cache:hits',
+    'misses': 'blog:page_cache:misses',
+}
+
+
+def page_cache_key(request):
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'blog:page:{path_hash}'
+
+
+def tag_key(tag):
+    return f'blog:page_tag:{tag}'
+
+
+def invalidate_pages(*tags):
+    cache.set_many(
+        {tag_key(tag): uuid4().hex for tag in tags if tag}, timeout=None
+    )
+
+
+def invalidate_post_feeds(post_id, author_id, category_id):
+    invalidate_feed_counts(author_id, category_id)
+    invalidate_pages(
+        f'post:{post_id}',
+        'feed:index',
+        f'feed:author:{author_id}',
+        f'feed:category:{category_id}',
+    )
+
+
+def get_tag_versions(tags):
+    versions = cache.get_many([tag_key(tag) for tag in tags])
+    missing = {
+        tag_key(tag): uuid4().hex
+        for tag in tags if tag_key(tag) not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {tag: versions[tag_key(tag)] for tag in tags}
+
+
+def post_tags(pk, author_id, category_id, location_id):
+    return (
+        f'post:{pk}',
+        f'user:{author_id}',
+        f'category:{category_id}',
+        f'location:{location_id}',
+    )
+
+
+def post_version(post):
+    return '.'.join(get_tag_versions(post_tags(
+        post.pk, post.author_id, post.category_id, post.location_id
+    )).values())
+
+
+def post_freshness(request, queryset, post_id):
+    if not hasattr(request, '_post_freshness'):
+        request._post_freshness = queryset.filter(pk=post_id).annotate(
+            last_comment_at=Max('comments__created_at')
+        ).values_list(
+            'updated_at', 'comment_count', 'last_comment_at',
+            'author__username', 'category__updated_at',
+            'location__updated_at'
+        ).first()
+    return request._post_freshness
+
+
+def post_etag(request, queryset, post_id):
+    row = post_freshness(request, queryset, post_id)
+    if row is None:
+        return None
+    return hashlib.md5('|'.join(map(str, row)).encode()).hexdigest()
+
+
+def post_last_modified(request, queryset, post_id):
+    row = post_freshness(request, queryset, post_id)
+    if row is None:
+        return None
+    updated_at, _, last_comment_at, _, *related_updated_at = row
+    return max(
+        moment for moment in (updated_at, last_comment_at, *related_updated_at)
+        if moment is not None
+    )
+
+
+def count_request(outcome):
+    key = STATS_KEYS[outcome]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def page_cache_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def get_cached_page(key):
+    entry = cache.get(key)
+    if entry is None or get_tag_versions(entry['tags']) != entry['tags']:
+        return None
+    response = HttpResponse(
+        entry['content'], content_type=entry['content_type']
+    )
+    return response
+
+
+def store_page(key, response, tags):
+    cache.set(key, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'tags': get_tag_versions(tags),
+    }, PAGE_CACHE_TIMEOUT)
@@ -0,0 +1,185 @@
+import base64
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .constants import (
+    FEED_COUNT_CACHE_TIMEOUT, PAGE_RANGE_ON_EACH_SIDE, PAGE_RANGE_ON_ENDS
+)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction, value, pk):
+    raw = f'{direction}|{value.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, value, pk = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        )
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError) as error:
+        raise InvalidCursor(cursor) from error
+
+
+class CursorPage:
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def row_value(row, name):
+    if isinstance(row, dict):
+        return row[name]
+    return getattr(row, name)
+
+
+class CursorPaginator:
+
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def _seek(self, descending, value=None, pk=None):
+        prefix, lookup = ('-', 'lt') if descending else ('', 'gt')
+        qs = self.queryset.order_by(prefix + self.field, prefix + 'pk')
+        if value is None:
+            return qs
+        return qs.filter(
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def page(self, cursor=None):
+        if not cursor:
+            direction, value, pk = 'next', None, None
+        else:
+            direction, value, pk = decode_cursor(cursor)
+
+        if direction == 'next':
+            qs = self._seek(self.descending, value, pk)
+        else:
+            qs = self._seek(not self.descending, value, pk)
+
+        rows = list(qs[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == 'prev':
+            rows.reverse()
+        if not rows:
+            return CursorPage(rows)
+
+        first, last = rows[0], rows[-1]
+        if direction == 'next':
+            has_next, has_previous = has_more, value is not None
+        else:
+            has_next, has_previous = True, has_more
+        return CursorPage(
+            rows,
+            next_cursor=(
+                encode_cursor(
+                    'next', row_value(last, self.field),
+                    row_value(last, 'pk')
+                )
+                if has_next else None
+            ),
+            previous_cursor=(
+                encode_cursor(
+                    'prev', row_value(first, self.field),
+                    row_value(first, 'pk')
+                )
+                if has_previous else None
+            ),
+        )
+
+    def get_page_or_404(self, cursor):
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            raise Http404('Некорректный курсор страницы.')
+
+
+def feed_count_cache_key(feed, *parts):
+    return ':'.join(('blog', 'feed_count', feed, *map(str, parts)))
+
+
+def invalidate_feed_counts(author_id=None, category_id=None):
+    keys = [feed_count_cache_key('index')]
+    if author_id is not None:
+        keys += [
+            feed_count_cache_key('author', author_id, 'all'),
+            feed_count_cache_key('author', author_id, 'published'),
+        ]
+    if category_id is not None:
+        keys.append(feed_count_cache_key('category', category_id))
+    cache.delete_many(keys)
+
+
+class WindowedPage(Page):
+
+    @property
+    def page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGE_RANGE_ON_EACH_SIDE,
+            on_ends=PAGE_RANGE_ON_ENDS
+        )
+
+
+class CachedCountPaginator(Paginator):
+
+    def __init__(self, *args, cache_key=None,
+                 cache_timeout=FEED_COUNT_CACHE_TIMEOUT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.cache_timeout)
+        return count
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+
+
+def switch_live(queryset, is_live):
+    with transaction.atomic():
+        return queryset.update(is_live=is_live)
+
+
+def publish_due_posts(now=None):
+    now = now or timezone.now()
+    published = switch_live(
+        Post.objects.filter(is_live=False, pub_date__lte=now), True
+    )
+    postponed = switch_live(
+        Post.objects.filter(is_live=True, pub_date__gt=now), False
+    )
+    return published, postponed
+
+
+def seconds_until_next_publication(now=None):
+    now = now or timezone.now()
+    next_pub_date = Post.objects.filter(is_live=False).aggregate(
+        next_pub_date=Min('pub_date')
+    )['next_pub_date']
+    if next_pub_date is None:
+        return None
+    return max((next_pub_date - now).total_seconds(), 0)
@@ -0,0 +1,218 @@
+import operator
+import re
+from functools import reduce
+from itertools import islice
+
+from django.db import connections
+from django.db.models import F, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .constants import SEARCH_REFRESH_CHUNK, SEARCH_SNIPPET_WORDS
+from .models import Comment, Post
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+WORD_RE = re.compile(r'\w+')
+RUSSIAN_ENDING_RE = re.compile(r'[аеёиоуыэюяйь]{1,2}$')
+
+WEIGHTS = 'ABCD'
+SQLITE_WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+
+def search_terms(query):
+    return WORD_RE.findall((query or '').lower())
+
+
+def prefix_term(term):
+    stem = RUSSIAN_ENDING_RE.sub('', term)
+    if len(stem) < 3:
+        stem = term
+    return f'"{stem}"*'
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet or '')
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_STOP, '</mark>')
+    )
+
+
+class FullTextIndex:
+
+    def __init__(self, model, fields, snippet_field, config='russian'):
+        self.model = model
+        self.fields = fields
+        self.snippet_field = snippet_field
+        self.config = config
+
+    def table_name(self, model=None):
+        return f'{(model or self.model)._meta.db_table}_fts'
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return reduce(operator.add, (
+            SearchVector(field, weight=weight, config=self.config)
+            for field, weight in zip(self.fields, WEIGHTS)
+        ))
+
+    def _execute_sqlite(self, using, model, pks, insert):
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return
+        quote = connection.ops.quote_name
+        meta = model._meta
+        table = quote(self.table_name(model))
+        columns = ', '.join(map(quote, self.fields))
+        pk = quote(meta.pk.column)
+        with connection.cursor() as cursor:
+            if pks is None:
+                cursor.execute(f'DELETE FROM {table}')
+                if insert:
+                    cursor.execute(
+                        f'INSERT INTO {table} (rowid, {columns}) '
+                        f'SELECT {pk}, {columns} '
+                        f'FROM {quote(meta.db_table)}'
+                    )
+                return
+            pks = iter(pks)
+            while True:
+                chunk = list(islice(pks, SEARCH_REFRESH_CHUNK))
+                if not chunk:
+                    return
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE rowid IN ({placeholders})',
+                    chunk
+                )
+                if insert:
+                    cursor.execute(
+                        f'INSERT INTO {table} (rowid, {columns}) '
+                        f'SELECT {pk}, {columns} '
+                        f'FROM {quote(meta.db_table)} '
+                        f'WHERE {pk} IN ({placeholders})',
+                        chunk
+                    )
+
+    def refresh(self, pks, using='default'):
+        self._execute_sqlite(using, self.model, pks, insert=True)
+
+    def delete(self, pks, using='default'):
+        self._execute_sqlite(using, self.model, pks, insert=False)
+
+    def rebuild(self, using='default', model=None):
+        self._execute_sqlite(using, model or self.model, None, insert=True)
+
+    def match_expression(self, terms):
+        return ' '.join(map(prefix_term, terms))
+
+    def search_query(self, terms):
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(' '.join(terms), config=self.config)
+
+    def matching(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        vendor = connections[queryset.db].vendor
+        if vendor == 'sqlite':
+            table = connections[queryset.db].ops.quote_name(
+                self.table_name()
+            )
+            return queryset.filter(pk__in=RawSQL(
+                f'SELECT rowid FROM {table} WHERE {table} MATCH %s',
+                (self.match_expression(terms),)
+            ))
+        if vendor == 'postgresql':
+            return queryset.annotate(search_vector=self.vector()).filter(
+                search_vector=self.search_query(terms)
+            )
+        return self._filter_like(queryset, terms)
+
+    def search(self, queryset, query):
+        terms = search_terms(query)
+        if not terms:
+            return queryset.none()
+        vendor = connections[queryset.db].vendor
+        if vendor == 'sqlite':
+            queryset = self._search_sqlite(queryset, terms)
+        elif vendor == 'postgresql':
+            queryset = self._search_postgresql(queryset, terms)
+        else:
+            queryset = self._search_like(queryset, terms)
+        return queryset.order_by('-search_rank', '-pk')
+
+    def _search_sqlite(self, queryset, terms):
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        table = quote(self.table_name())
+        meta = self.model._meta
+        weights = ', '.join(
+            str(SQLITE_WEIGHTS[weight])
+            for _, weight in zip(self.fields, WEIGHTS)
+        )
+        return queryset.extra(
+            tables=[self.table_name()],
+            where=[
+                f'{table}.rowid = '
+                f'{quote(meta.db_table)}.{quote(meta.pk.column)}',
+                f'{table} MATCH %s',
+            ],
+            params=[self.match_expression(terms)],
+            select={
+                'search_rank': f'-bm25({table}, {weights})',
+                'search_snippet': (
+                    f'snippet({table}, '
+                    f'{self.fields.index(self.snippet_field)}, '
+                    "%s, %s, '…', %s)"
+                ),
+            },
+            select_params=(
+                HIGHLIGHT_START, HIGHLIGHT_STOP, SEARCH_SNIPPET_WORDS
+            ),
+        )
+
+    def _search_postgresql(self, queryset, terms):
+        from django.contrib.postgres.search import SearchHeadline, SearchRank
+
+        search_query = self.search_query(terms)
+        vector = self.vector()
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, search_query),
+            search_snippet=SearchHeadline(
+                self.snippet_field,
+                search_query,
+                config=self.config,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=SEARCH_SNIPPET_WORDS,
+                min_words=SEARCH_SNIPPET_WORDS // 2,
+            ),
+        ).filter(search_vector=search_query)
+
+    def _filter_like(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(reduce(operator.or_, (
+                Q(**{f'{field}__icontains': term}) for field in self.fields
+            )))
+        return queryset
+
+    def _search_like(self, queryset, terms):
+        return self._filter_like(queryset, terms).annotate(
+            search_rank=Value(0.0), search_snippet=F(self.snippet_field)
+        )
+
+
+POST_SEARCH_INDEX = FullTextIndex(
+    Post, fields=('title', 'text'), snippet_field='text'
+)
+
+COMMENT_SEARCH_INDEX = FullTextIndex(
+    Comment, fields=('text',), snippet_field='text'
+)
@@ -0,0 +1,146 @@
+import random
+from array import array
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from .backup import import_records
+from .constants import IMPORT_BATCH_SIZE, USER
+from .models import Category, Comment, Location, Post
+
+SEED_TEXT_POOL_SIZE = 500
+
+SEED_PASSWORD = 'blogicum'
+
+
+class BlogSeeder:
+
+    def __init__(self, seed=None, days=365):
+        self.random = random.Random(seed)
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.now = timezone.now()
+        self.days = days
+        self.sentences = [
+            self.faker.sentence() for _ in range(SEED_TEXT_POOL_SIZE)
+        ]
+        self.words = [
+            self.faker.word() for _ in range(SEED_TEXT_POOL_SIZE)
+        ]
+
+    def next_pk(self, model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def text(self, sentences):
+        return ' '.join(self.random.choices(self.sentences, k=sentences))
+
+    def title(self):
+        return ' '.join(
+            self.random.choices(self.words, k=self.random.randint(1, 4))
+        ).capitalize()
+
+    def moment(self):
+        return self.now - timedelta(
+            seconds=self.random.randint(60, self.days * 24 * 60 * 60)
+        )
+
+    def users(self, count):
+        start = self.next_pk(USER)
+        password = make_password(SEED_PASSWORD)
+        for pk in range(start, start + count):
+            yield {'model': 'auth.user', 'pk': pk, 'fields': {
+                'username': f'{self.faker.user_name()}_{pk}',
+                'password': password,
+                'email': f'user{pk}@example.com',
+                'first_name': self.faker.first_name(),
+                'last_name': self.faker.last_name(),
+                'is_active': True,
+                'date_joined': self.moment(),
+            }}
+
+    def categories(self, count):
+        start = self.next_pk(Category)
+        for pk in range(start, start + count):
+            yield {'model': 'blog.category', 'pk': pk, 'fields': {
+                'title': self.title(),
+                'description': self.text(2),
+                'slug': f'category-{pk}',
+                'is_published': True,
+                'created_at': self.moment(),
+            }}
+
+    def locations(self, count):
+        start = self.next_pk(Location)
+        for pk in range(start, start + count):
+            yield {'model': 'blog.location', 'pk': pk, 'fields': {
+                'name': self.faker.city(),
+                'is_published': True,
+                'created_at': self.moment(),
+            }}
+
+    def posts(self, count):
+        start = self.next_pk(Post)
+        authors = list(USER.objects.values_list('pk', flat=True))
+        categories = list(Category.objects.values_list('pk', flat=True))
+        locations = list(Location.objects.values_list('pk', flat=True))
+        for pk in range(start, start + count):
+            pub_date = self.moment()
+            yield {'model': 'blog.post', 'pk': pk, 'fields': {
+                'title': self.title(),
+                'text': self.text(self.random.randint(1, 8)),
+                'pub_date': pub_date,
+                'created_at': pub_date,
+                'is_published': True,
+                'author': self.random.choice(authors),
+                'category': self.random.choice(categories),
+                'location': (
+                    self.random.choice(locations) if locations else None
+                ),
+                'image': '',
+            }}
+
+    def comments(self, post_start, comment_counts):
+        start = self.next_pk(Comment)
+        authors = list(USER.objects.values_list('pk', flat=True))
+        pk = start
+        for index, count in enumerate(comment_counts):
+            for _ in range(count):
+                yield {'model': 'blog.comment', 'pk': pk, 'fields': {
+                    'post': post_start + index,
+                    'author': self.random.choice(authors),
+                    'text': self.text(self.random.randint(1, 3)),
+                    'created_at': self.moment(),
+                }}
+                pk += 1
+
+    def comment_counts(self, posts, comments):
+        counts = array('I', [0]) * posts
+        for _ in range(comments if posts else 0):
+            counts[self.random.randrange(posts)] += 1
+        return counts
+
+    def seed(self, users=0, categories=0, locations=0, posts=0,
+             comments=0, batch_size=IMPORT_BATCH_SIZE):
+        results = []
+        for generate, count in (
+            (self.users, users),
+            (self.categories, categories),
+            (self.locations, locations),
+        ):
+            if count:
+                results.append(
+                    import_records(generate(count), batch_size=batch_size)
+                )
+        if posts:
+            counts = self.comment_counts(posts, comments)
+            post_start = self.next_pk(Post)
+            results.append(import_records(
+                self.posts(posts), batch_size=batch_size
+            ))
+            results.append(import_records(
+                self.comments(post_start, counts), batch_size=batch_size
+            ))
+        return results
@@ -1,3 +1,4 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
 from blog.models import Post
@@ -7,3 +8,59 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ('title', 'text', 'author', 'pub_date')
+
+
+POST_API_FIELDS = {
+    'id': 'pk',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'comment_count': 'comment_count',
+    'image': 'image',
+}
+
+DEFAULT_POST_API_FIELDS = (
+    'id', 'title', 'pub_date', 'author', 'category', 'location',
+    'comment_count',
+)
+
+
+def parse_post_api_fields(raw_fields):
+    if not raw_fields:
+        return DEFAULT_POST_API_FIELDS
+    fields = tuple(dict.fromkeys(
+        field.strip() for field in raw_fields.split(',') if field.strip()
+    ))
+    unknown = set(fields) - POST_API_FIELDS.keys()
+    if unknown:
+        raise serializers.ValidationError(
+            {'fields': f'Неизвестные поля: {", ".join(sorted(unknown))}'}
+        )
+    return fields
+
+
+class PostValuesSerializer:
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def get_value_paths(self):
+        paths = {'pk', 'pub_date'} | {
+            POST_API_FIELDS[field] for field in self.fields
+        }
+        if 'location' in self.fields:
+            paths.add('location__is_published')
+        return paths
+
+    def to_representation(self, row):
+        data = {field: row[POST_API_FIELDS[field]] for field in self.fields}
+        if 'location' in data and not row['location__is_published']:
+            data['location'] = None
+        if 'image' in data:
+            data['image'] = (
+                default_storage.url(data['image']) if data['image'] else None
+            )
+        return data
@@ -0,0 +1,332 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .constants import USER
+from .feed import (
+    refresh_author, refresh_category, refresh_feed_entries, refresh_location,
+    shift_comment_count
+)
+from .images import (
+    find_duplicate, read_metadata, release_variants, save_image_metadata
+)
+from .models import Category, Comment, Location, Post, PostImage
+from .page_cache import invalidate_pages, invalidate_post_feeds
+from .pagination import invalidate_feed_counts
+from .search import COMMENT_SEARCH_INDEX, POST_SEARCH_INDEX
+from .sync import (
+    VISIBILITY_FIELDS, affects_visibility, record_changes,
+    record_dependent_changes
+)
+from .tasks import enqueue_image_task
+from core.signals import queryset_updated
+
+SYNCED_MODELS = {
+    Post: 'post',
+    Comment: 'comment',
+    Category: 'category',
+    Location: 'location',
+}
+
+
+def touch_posts(post_ids):
+    Post._base_manager.filter(pk__in=post_ids).update(
+        updated_at=timezone.now()
+    )
+    invalidate_pages(*(f'post:{pk}' for pk in post_ids))
+
+
+def change_comment_count(post_id, delta):
+    Post._base_manager.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta,
+        updated_at=timezone.now()
+    )
+    shift_comment_count(post_id, delta)
+    record_changes('post', (post_id,))
+    invalidate_pages(f'post:{post_id}')
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list('post_id', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+    else:
+        touch_posts((instance.post_id,))
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_save, sender=Post)
+def update_post_is_live(sender, instance, **kwargs):
+    instance.is_live = instance.pub_date <= timezone.now()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = (
+        Post.objects.filter(pk=instance.pk)
+        .values('author_id', 'image', *VISIBILITY_FIELDS['post'])
+        .first()
+    )
+    if previous:
+        instance._previous_feeds = (
+            previous['author_id'], previous['category_id']
+        )
+        instance._previous_image = previous['image']
+        instance._previous_visibility = tuple(
+            previous[field] for field in VISIBILITY_FIELDS['post']
+        )
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_visibility(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._previous_visibility = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list(*VISIBILITY_FIELDS['category'])
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Post)
+def reset_post_image_status(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    previous_image = getattr(instance, '_previous_image', None) or ''
+    instance._image_changed = (instance.image.name or '') != previous_image
+    if not instance._image_changed:
+        return
+    instance.image_status = 'pending' if instance.image else ''
+    instance._image_metadata = None
+    if not instance.image:
+        return
+    try:
+        metadata = read_metadata(instance.image)
+    except (OSError, ValueError):
+        return
+    duplicate = find_duplicate(metadata['sha256'])
+    if duplicate is not None and not instance.image._committed:
+        instance.image.name = duplicate
+        instance.image._committed = True
+    instance._image_metadata = metadata
+
+
+@receiver(post_save, sender=Post)
+def enqueue_saved_post_image(sender, instance, raw, **kwargs):
+    if raw or not getattr(instance, '_image_changed', False):
+        return
+    instance._image_changed = False
+    if not instance.image:
+        PostImage.objects.filter(post=instance).delete()
+        return
+    if instance._image_metadata is not None:
+        save_image_metadata(instance, instance._image_metadata)
+    enqueue_image_task(instance.pk)
+
+
+@receiver(post_delete, sender=PostImage)
+def delete_post_image_variants(sender, instance, **kwargs):
+    release_variants(instance)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_feeds(sender, instance, **kwargs):
+    previous_feeds = getattr(instance, '_previous_feeds', None)
+    if previous_feeds:
+        invalidate_post_feeds(instance.pk, *previous_feeds)
+    invalidate_post_feeds(
+        instance.pk, instance.author_id, instance.category_id
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    invalidate_post_feeds(
+        instance.pk, instance.author_id, instance.category_id
+    )
+
+
+def invalidate_category(category_id):
+    invalidate_feed_counts(category_id=category_id)
+    invalidate_pages('feed', f'category:{category_id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_feeds(sender, instance, **kwargs):
+    invalidate_category(instance.pk)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    invalidate_pages(f'location:{instance.pk}')
+
+
+@receiver(queryset_updated)
+def invalidate_updated_pages(sender, queryset, **kwargs):
+    if sender is Post:
+        for post in queryset.values_list(
+            'pk', 'author_id', 'category_id'
+        ).iterator():
+            invalidate_post_feeds(*post)
+    elif sender is Category:
+        for pk in queryset.values_list('pk', flat=True).iterator():
+            invalidate_category(pk)
+    elif sender is Location:
+        invalidate_pages(*(
+            f'location:{pk}'
+            for pk in queryset.values_list('pk', flat=True).iterator()
+        ))
+
+
+@receiver(pre_save, sender=USER)
+def remember_username(sender, instance, raw, update_fields, **kwargs):
+    instance._username_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    previous = (
+        USER.objects.filter(pk=instance.pk)
+        .values_list('username', flat=True)
+        .first()
+    )
+    instance._username_changed = (
+        previous is not None and previous != instance.username
+    )
+
+
+@receiver(post_save, sender=USER)
+def invalidate_user_pages(sender, instance, **kwargs):
+    if instance._username_changed:
+        touch_posts(set(
+            Comment.objects.filter(author=instance)
+            .values_list('post_id', flat=True)
+        ))
+        invalidate_pages(f'user:{instance.pk}')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def journal_saved_object(sender, instance, **kwargs):
+    model_name = SYNCED_MODELS[sender]
+    record_changes(model_name, (instance.pk,))
+    previous = getattr(instance, '_previous_visibility', None)
+    if previous is None:
+        return
+    current = tuple(
+        getattr(instance, field) for field in VISIBILITY_FIELDS[model_name]
+    )
+    if current != previous:
+        record_dependent_changes(
+            model_name, sender.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def journal_deleted_object(sender, instance, **kwargs):
+    record_changes(SYNCED_MODELS[sender], (instance.pk,), deleted=True)
+
+
+@receiver(queryset_updated)
+def journal_updated_objects(sender, queryset, fields, **kwargs):
+    if sender not in SYNCED_MODELS:
+        return
+    model_name = SYNCED_MODELS[sender]
+    record_changes(
+        model_name, queryset.values_list('pk', flat=True).iterator()
+    )
+    if affects_visibility(model_name, fields):
+        record_dependent_changes(model_name, queryset)
+
+
+@receiver(post_save, sender=Post)
+def refresh_saved_post_feed(sender, instance, **kwargs):
+    refresh_feed_entries((instance.pk,))
+
+
+@receiver(post_save, sender=Category)
+def refresh_saved_category_feed(sender, instance, **kwargs):
+    refresh_category(instance)
+
+
+@receiver(post_save, sender=Location)
+def refresh_saved_location_feed(sender, instance, **kwargs):
+    refresh_location(instance)
+
+
+@receiver(post_save, sender=USER)
+def refresh_saved_author_feed(sender, instance, raw, **kwargs):
+    if raw or instance._username_changed:
+        refresh_author(instance, add_due=raw)
+
+
+@receiver(queryset_updated)
+def refresh_updated_feed(sender, queryset, **kwargs):
+    if sender is Post:
+        refresh_feed_entries(queryset.values_list('pk', flat=True).iterator())
+    elif sender is Category:
+        for category in queryset:
+            refresh_category(category)
+    elif sender is Location:
+        for location in queryset:
+            refresh_location(location)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, using, **kwargs):
+    POST_SEARCH_INDEX.refresh((instance.pk,), using)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, using, **kwargs):
+    POST_SEARCH_INDEX.delete((instance.pk,), using)
+
+
+@receiver(queryset_updated, sender=Post)
+def index_updated_posts(sender, queryset, fields, **kwargs):
+    if fields.intersection(POST_SEARCH_INDEX.fields):
+        POST_SEARCH_INDEX.refresh(
+            queryset.values_list('pk', flat=True).iterator(), queryset.db
+        )
+
+
+@receiver(post_save, sender=Comment)
+def index_saved_comment(sender, instance, using, **kwargs):
+    COMMENT_SEARCH_INDEX.refresh((instance.pk,), using)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_deleted_comment(sender, instance, using, **kwargs):
+    COMMENT_SEARCH_INDEX.delete((instance.pk,), using)
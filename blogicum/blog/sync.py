@@ -0,0 +1,182 @@
+import json
+from itertools import islice
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .constants import SYNC_BATCH_SIZE, SYNC_MAX_EVENTS, SYNC_SAFETY_LAG
+from .models import Category, ChangeEvent, Comment, Location, Post
+
+TOKEN_SALT = 'blog.sync'
+
+VISIBILITY_FIELDS = {
+    'post': ('category_id', 'is_published', 'is_live'),
+    'category': ('is_published',),
+}
+
+SYNC_MODELS = {
+    'post': (Post, {
+        'id': 'pk',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'author': 'author__username',
+        'category': 'category_id',
+        'location': 'location_id',
+        'comment_count': 'comment_count',
+        'updated_at': 'updated_at',
+    }),
+    'comment': (Comment, {
+        'id': 'pk',
+        'post': 'post_id',
+        'author': 'author__username',
+        'text': 'text',
+        'created_at': 'created_at',
+    }),
+    'category': (Category, {
+        'id': 'pk',
+        'title': 'title',
+        'description': 'description',
+        'slug': 'slug',
+        'is_published': 'is_published',
+        'updated_at': 'updated_at',
+    }),
+    'location': (Location, {
+        'id': 'pk',
+        'name': 'name',
+        'is_published': 'is_published',
+        'updated_at': 'updated_at',
+    }),
+}
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+def make_token(event_id):
+    return signing.dumps(event_id, salt=TOKEN_SALT)
+
+
+def read_token(token):
+    if not token:
+        return 0
+    try:
+        return int(signing.loads(token, salt=TOKEN_SALT))
+    except (signing.BadSignature, TypeError, ValueError) as error:
+        raise InvalidSyncToken(token) from error
+
+
+def record_changes(model_name, object_ids, deleted=False):
+    object_ids = iter(object_ids)
+    while True:
+        chunk = list(islice(object_ids, SYNC_BATCH_SIZE))
+        if not chunk:
+            return
+        ChangeEvent.objects.bulk_create(
+            ChangeEvent(model_name=model_name, object_id=pk, deleted=deleted)
+            for pk in chunk
+        )
+
+
+def affects_visibility(model_name, fields):
+    model = SYNC_MODELS[model_name][0]
+    return any(
+        model._meta.get_field(field).attname
+        in VISIBILITY_FIELDS.get(model_name, ())
+        for field in fields
+    )
+
+
+def record_dependent_changes(model_name, queryset):
+    if model_name == 'category':
+        record_changes('post', Post.objects.filter(
+            category__in=queryset
+        ).values_list('pk', flat=True).iterator())
+        comments = Comment.objects.filter(post__category__in=queryset)
+    elif model_name == 'post':
+        comments = Comment.objects.filter(post__in=queryset)
+    else:
+        return
+    record_changes(
+        'comment', comments.values_list('pk', flat=True).iterator()
+    )
+
+
+def visible_rows(model_name, object_ids):
+    model, fields = SYNC_MODELS[model_name]
+    qs = model.objects.filter(pk__in=object_ids)
+    if model is Post:
+        qs = qs.filter(
+            is_published=True,
+            category__is_published=True,
+            is_live=True
+        )
+    elif model is Comment:
+        qs = qs.filter(
+            post__is_published=True,
+            post__category__is_published=True,
+            post__is_live=True
+        )
+    rows = qs.values(*fields.values())
+    return {
+        row['pk']: {name: row[path] for name, path in fields.items()}
+        for row in rows
+    }
+
+
+def resolve_events(events):
+    latest = {}
+    for model_name, object_id, deleted in events:
+        latest.pop((model_name, object_id), None)
+        latest[(model_name, object_id)] = deleted
+    wanted = {}
+    for (model_name, object_id), deleted in latest.items():
+        if not deleted:
+            wanted.setdefault(model_name, []).append(object_id)
+    rows = {
+        model_name: visible_rows(model_name, object_ids)
+        for model_name, object_ids in wanted.items()
+    }
+    for (model_name, object_id), deleted in latest.items():
+        data = rows.get(model_name, {}).get(object_id)
+        if data is None:
+            yield {'model': model_name, 'id': object_id, 'deleted': True}
+        else:
+            yield {
+                'model': model_name, 'id': object_id, 'deleted': False,
+                'data': data,
+            }
+
+
+def stream_changes(since_id):
+    # Journal ids are allocated before commit, so with concurrent writers
+    # a lower id may become visible after a higher one. Events younger
+    # than the safety lag are left for the next request, otherwise the
+    # token could move past a transaction that has not committed yet.
+    settled = ChangeEvent.objects.filter(
+        changed_at__lte=timezone.now() - SYNC_SAFETY_LAG
+    )
+    last_id = since_id
+    sent = 0
+    separator = ''
+    yield '{"changes": ['
+    while sent < SYNC_MAX_EVENTS:
+        events = list(
+            settled
+            .filter(id__gt=last_id)
+            .values_list('id', 'model_name', 'object_id', 'deleted')
+            [:SYNC_BATCH_SIZE]
+        )
+        if not events:
+            break
+        last_id = events[-1][0]
+        sent += len(events)
+        for change in resolve_events(event[1:] for event in events):
+            yield separator + json.dumps(change, cls=DjangoJSONEncoder)
+            separator = ','
+    has_more = settled.filter(id__gt=last_id).exists()
+    yield '], ' + json.dumps({
+        'next': make_token(last_id), 'has_more': has_more
+    })[1:]
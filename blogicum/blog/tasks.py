@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .constants import (
+    IMAGE_TASK_LEASE, IMAGE_TASK_MAX_ATTEMPTS, IMAGE_TASK_RETRY_DELAY
+)
+from .images import process_post_image
+from .models import ImageTask, Post
+
+
+def enqueue_image_task(post_id):
+    ImageTask.objects.update_or_create(post_id=post_id, defaults={
+        'attempts': 0,
+        'run_after': timezone.now(),
+        'locked_until': None,
+        'last_error': '',
+    })
+
+
+def claim_next_task(now=None):
+    now = now or timezone.now()
+    due = ImageTask.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        run_after__lte=now
+    )
+    for task in due.order_by('run_after', 'id')[:10]:
+        claimed = due.filter(pk=task.pk).update(
+            locked_until=now + timedelta(seconds=IMAGE_TASK_LEASE)
+        )
+        if claimed:
+            return task
+    return None
+
+
+def run_image_task(task):
+    post = Post.objects.filter(pk=task.post_id).first()
+    if post is None:
+        task.delete()
+        return True
+    try:
+        process_post_image(post)
+    except Exception as error:
+        fail_image_task(task, post, error)
+        return False
+    ImageTask.objects.filter(
+        pk=task.pk, run_after=task.run_after
+    ).delete()
+    return True
+
+
+def fail_image_task(task, post, error):
+    task.attempts += 1
+    task.last_error = f'{type(error).__name__}: {error}'
+    task.locked_until = None
+    if task.attempts >= IMAGE_TASK_MAX_ATTEMPTS:
+        task.run_after = None
+        Post.objects.filter(pk=post.pk, image=post.image.name).update(
+            image_status='failed'
+        )
+    else:
+        task.run_after = timezone.now() + timedelta(
+            seconds=IMAGE_TASK_RETRY_DELAY * 2 ** (task.attempts - 1)
+        )
+    task.save()
+
+
+def process_image_tasks(limit=None):
+    processed = failed = 0
+    while limit is None or processed + failed < limit:
+        task = claim_next_task()
+        if task is None:
+            break
+        if run_image_task(task):
+            processed += 1
+        else:
+            failed += 1
+    return processed, failed
@@ -1,6 +1,11 @@
 import textwrap
 
 from django import template
+from django.conf import settings
+
+from blog import images
+from blog.page_cache import post_version
+from blog.search import highlight
 
 register = template.Library()
 
@@ -14,3 +19,39 @@ def wrap_text(value, arg):
     wrapper = textwrap.TextWrapper(width=int(arg))
     word_list = wrapper.wrap(text=value)
     return '<br>'.join(word_list)
+
+
+@register.filter
+def post_card_version(post):
+    """
+    Фильтр возвращает метку версии карточки поста, которая меняется
+    при изменении поста, его автора, категории или местоположения.
+    """
+    return post_version(post)
+
+
+@register.simple_tag
+def post_card_cache_timeout():
+    """
+    Тег возвращает время хранения карточки поста в кэше
+    из настройки BLOG_POST_CARD_CACHE_TIMEOUT.
+    """
+    return settings.BLOG_POST_CARD_CACHE_TIMEOUT
+
+
+@register.filter
+def search_highlight(snippet):
+    """
+    Фильтр экранирует фрагмент найденного текста
+    и выделяет совпадения тегом <mark>.
+    """
+    return highlight(snippet)
+
+
+@register.filter
+def srcset(variants, image_format):
+    """
+    Фильтр собирает атрибут srcset из уменьшенных копий
+    изображения в указанном формате.
+    """
+    return images.srcset(variants, image_format)
@@ -21,6 +21,10 @@ posts_urls = [
         '<int:post_id>/delete/',
         views.PostDeleteView.as_view(), name='delete_post'
     ),
+    path(
+        '<int:post_id>/comments/',
+        views.CommentListView.as_view(), name='comments'
+    ),
     path(
         '<int:post_id>/comment/',
         views.CommentCreateView.as_view(), name='add_comment'
@@ -40,6 +44,7 @@ urlpatterns = [
     path(
         'posts/', include(posts_urls)
     ),
+    path('search/', views.PostSearchView.as_view(), name='search'),
     path(
         'category/<slug:category_slug>/',
         views.CategoryPostsListView.as_view(), name='category_posts'
@@ -52,5 +57,8 @@ urlpatterns = [
         'profile/<str:username>/',
         views.ProfileListView.as_view(), name='profile'
     ),
+    path('api/posts/', views.PostListAPIView.as_view(), name='api_posts'),
+    path('api/sync/', views.SyncAPIView.as_view(), name='api_sync'),
+    path('api/export/', views.ExportView.as_view(), name='api_export'),
     path('api/<int:post_id>', views.get_post, name='api_post')
 ]
@@ -1,27 +1,63 @@
+from datetime import datetime, time
+
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
-    UpdateView
+    UpdateView,
+    View
 )
+from rest_framework.exceptions import ValidationError
 
-from .constants import POSTS_PER_PAGE, USER
+from .backup import (
+    BACKUP_MODELS, DEFAULT_EXPORT_MODELS, export_lines, gzip_stream
+)
+from .constants import API_POSTS_PER_PAGE, POSTS_PER_PAGE, USER
 from .forms import CommentForm, PostForm
 from .mixins import (
+    AnonymousPageCacheMixin,
+    CachedCountMixin,
+    CommentsPaginationMixin,
     CommentSuccessUrlMixin,
+    CursorPaginationMixin,
     OnlyAuthorMixin,
     PostsQuerySetMixin
 )
-from .models import Category, Comment, Post
-from .serializers import PostSerializer
+from .models import Category, Comment, FeedEntry, Post
+from .page_cache import post_etag, post_last_modified
+from .pagination import (
+    CachedCountPaginator, CursorPaginator, feed_count_cache_key
+)
+from .search import POST_SEARCH_INDEX
+from .serializers import (
+    PostSerializer, PostValuesSerializer, parse_post_api_fields
+)
+from .sync import InvalidSyncToken, read_token, stream_changes
+
+
+def get_post_etag(request, post_id):
+    return post_etag(request, Post.objects.all(), post_id)
+
+
+def get_post_last_modified(request, post_id):
+    return post_last_modified(request, Post.objects.all(), post_id)
 
 
+@condition(etag_func=get_post_etag, last_modified_func=get_post_last_modified)
 def get_post(request, post_id):
     if request.method == 'GET':
         post = get_object_or_404(Post, id=post_id)
@@ -29,61 +65,234 @@ def get_post(request, post_id):
         return JsonResponse(serializer.data)
 
 
-class HomepageListView(PostsQuerySetMixin, ListView):
+class PostListAPIView(PostsQuerySetMixin, View):
+    filter_lookups = {
+        'category': 'category__slug',
+        'author': 'author__username',
+        'since': 'pub_date__gte',
+        'until': 'pub_date__lt',
+    }
+
+    def parse_datetime_param(self, name, value):
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                parsed_date = parse_date(value)
+                if parsed_date is None:
+                    raise ValueError(value)
+                parsed = datetime.combine(parsed_date, time.min)
+        except ValueError:
+            raise ValidationError(
+                {name: 'Ожидается дата или дата и время в ISO 8601.'}
+            )
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def get_api_filters(self):
+        filters = {}
+        for name, lookup in self.filter_lookups.items():
+            value = self.request.GET.get(name)
+            if not value:
+                continue
+            if name in ('since', 'until'):
+                value = self.parse_datetime_param(name, value)
+            filters[lookup] = value
+        return filters
+
+    def get(self, request):
+        try:
+            fields = parse_post_api_fields(request.GET.get('fields'))
+            filters = self.get_api_filters()
+        except ValidationError as error:
+            return JsonResponse({'errors': error.detail}, status=400)
+        serializer = PostValuesSerializer(fields)
+        qs = (
+            Post.objects
+            .filter(self.get_published_filter(), **filters)
+            .values(*serializer.get_value_paths())
+        )
+        page = CursorPaginator(qs, API_POSTS_PER_PAGE).get_page_or_404(
+            request.GET.get('cursor')
+        )
+        next_url = None
+        if page.has_next():
+            params = request.GET.copy()
+            params['cursor'] = page.next_cursor
+            next_url = request.build_absolute_uri(f'?{params.urlencode()}')
+        return JsonResponse({
+            'results': [serializer.to_representation(row) for row in page],
+            'next': next_url,
+        })
+
+
+class SyncAPIView(View):
+
+    def get(self, request):
+        try:
+            since_id = read_token(request.GET.get('since'))
+        except InvalidSyncToken:
+            return JsonResponse(
+                {'errors': {'since': 'Некорректный токен синхронизации.'}},
+                status=400
+            )
+        return StreamingHttpResponse(
+            stream_changes(since_id), content_type='application/json'
+        )
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ExportView(View):
+
+    def get(self, request):
+        model_names = request.GET.get('models')
+        model_names = (
+            model_names.split(',') if model_names else DEFAULT_EXPORT_MODELS
+        )
+        unknown = set(model_names) - set(BACKUP_MODELS)
+        if unknown:
+            return JsonResponse(
+                {'errors': {'models': sorted(unknown)}}, status=400
+            )
+        lines = export_lines(model_names)
+        filename = 'blog-export.ndjson'
+        if request.GET.get('gzip'):
+            response = StreamingHttpResponse(
+                gzip_stream(lines), content_type='application/gzip'
+            )
+            filename += '.gz'
+        else:
+            response = StreamingHttpResponse(
+                lines, content_type='application/x-ndjson; charset=utf-8'
+            )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+
+class HomepageListView(
+    AnonymousPageCacheMixin,
+    CachedCountMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView
+):
     model = Post
     paginate_by = POSTS_PER_PAGE
     template_name = "blog/index.html"
+    page_cache_tags = ('feed', 'feed:index')
 
     def get_queryset(self):
-        return self.get_filtered_queryset()
+        return FeedEntry.objects.as_posts()
+
+    def get_count_cache_key(self):
+        return feed_count_cache_key('index')
 
 
-class CategoryPostsListView(PostsQuerySetMixin, ListView):
+class PostSearchView(PostsQuerySetMixin, ListView):
     model = Post
     paginate_by = POSTS_PER_PAGE
-    template_name = 'blog/category.html'
+    paginator_class = CachedCountPaginator
+    template_name = 'blog/search.html'
+
+    @cached_property
+    def query(self):
+        return self.request.GET.get('q', '').strip()
 
     def get_queryset(self):
-        category_obj = get_object_or_404(
+        return POST_SEARCH_INDEX.search(
+            self.get_filtered_queryset(), self.query
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
+class CategoryPostsListView(
+    AnonymousPageCacheMixin,
+    CachedCountMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView
+):
+    model = Post
+    paginate_by = POSTS_PER_PAGE
+    template_name = 'blog/category.html'
+
+    @cached_property
+    def category(self):
+        return get_object_or_404(
             Category,
+            is_published=True,
             slug=self.kwargs['category_slug']
         )
+
+    @property
+    def page_cache_tags(self):
+        return ('feed', f'feed:category:{self.category.id}')
+
+    def get_queryset(self):
         qs = self.get_filtered_queryset()
-        return qs.filter(category=category_obj)
+        return qs.filter(category_id=self.category.id)
+
+    def get_count_cache_key(self):
+        return feed_count_cache_key('category', self.category.id)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category.objects.only('is_published', 'slug'),
-            is_published=True, slug=self.kwargs['category_slug']
-        )
+        context['category'] = self.category
         return context
 
 
-class ProfileListView(PostsQuerySetMixin, ListView):
+class ProfileListView(
+    AnonymousPageCacheMixin,
+    CachedCountMixin,
+    CursorPaginationMixin,
+    PostsQuerySetMixin,
+    ListView
+):
     model = Post
     paginate_by = POSTS_PER_PAGE
     template_name = 'blog/profile.html'
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
+    @cached_property
+    def profile(self):
+        return get_object_or_404(
             USER,
             username=self.kwargs['username']
         )
+
+    @property
+    def is_own_profile(self):
+        return self.profile == self.request.user
+
+    @property
+    def page_cache_tags(self):
+        return ('feed', f'feed:author:{self.profile.id}')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['profile'] = self.profile
         return context
 
     def get_queryset(self):
-        user_obj = get_object_or_404(
-            USER,
-            username=self.kwargs['username']
-        )
-        if user_obj == self.request.user:
+        if self.is_own_profile:
             qs = self.get_base_queryset()
         else:
             qs = self.get_filtered_queryset()
 
-        return qs.filter(author=user_obj)
+        return qs.filter(author_id=self.profile.id)
+
+    def get_count_cache_key(self):
+        return feed_count_cache_key(
+            'author',
+            self.profile.id,
+            'all' if self.is_own_profile else 'published'
+        )
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -100,28 +309,63 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    AnonymousPageCacheMixin,
+    CommentsPaginationMixin,
+    PostsQuerySetMixin,
+    DetailView
+):
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
 
+    def get_etag(self, request, post_id):
+        if request.user.is_authenticated:
+            return None
+        return post_etag(
+            request, Post.objects.filter(self.get_published_filter()), post_id
+        )
+
+    def get_last_modified(self, request, post_id):
+        if request.user.is_authenticated:
+            return None
+        return post_last_modified(
+            request, Post.objects.filter(self.get_published_filter()), post_id
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        return condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified
+        )(super().dispatch)(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return self.get_base_queryset().filter(self.get_visible_filter())
+
     def get_context_data(self, **kwargs):
-        user = self.request.user
         context = super().get_context_data(**kwargs)
-        post_obj = self.get_object()
-        if user != post_obj.author:
-            post_obj = get_object_or_404(
-                Post,
-                id=self.kwargs['post_id'],
-                category__is_published=True,
-                is_published=True,
-                pub_date__lte=timezone.now()
-            )
-        context['comments'] = post_obj.comments.select_related('author')
+        context['comments'] = self.get_comments_page(self.object)
         context['form'] = CommentForm()
         return context
 
 
+class CommentListView(CommentsPaginationMixin, PostsQuerySetMixin, View):
+
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.filter(self.get_visible_filter()), id=post_id
+        )
+        comments = self.get_comments_page(post)
+        return JsonResponse({
+            'html': render_to_string(
+                'includes/comment_list.html',
+                {'post': post, 'comments': comments},
+                request=request
+            ),
+            'next': comments.next_cursor,
+        })
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     form_class = PostForm
@@ -163,6 +407,7 @@ class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
         return reverse('blog:index')
 
 
+@method_decorator(transaction.atomic, name='post')
 class CommentCreateView(
     LoginRequiredMixin,
     CommentSuccessUrlMixin,
@@ -192,6 +437,7 @@ class CommentUpdateView(
     pk_url_kwarg = 'comment_id'
 
 
+@method_decorator(transaction.atomic, name='post')
 class CommentDeleteView(
     LoginRequiredMixin,
     CommentSuccessUrlMixin,
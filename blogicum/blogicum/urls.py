@@ -5,6 +5,8 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from core.views import metrics
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -19,6 +21,7 @@ urlpatterns = [
         name='registration'
     ),
     path('pages/', include('pages.urls')),
+    path('metrics', metrics, name='metrics'),
     path('', include('blog.urls')),
 ]
 
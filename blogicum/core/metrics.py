@@ -0,0 +1,153 @@
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+def escape_label(value):
+    return (
+        str(value).replace('\\', '\\\\')
+        .replace('"', '\\"').replace('\n', '\\n')
+    )
+
+
+def format_labels(labels):
+    return ','.join(
+        f'{name}="{escape_label(value)}"' for name, value in labels
+    )
+
+
+class Histogram:
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.samples = {}
+
+    def observe(self, labels, value):
+        sample = self.samples.setdefault(
+            labels, [0] * len(self.buckets) + [0, 0]
+        )
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                sample[index] += 1
+        sample[-2] += value
+        sample[-1] += 1
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, sample in sorted(self.samples.items()):
+            label_text = format_labels(labels)
+            bounds = (*self.buckets, '+Inf')
+            for bound, count in zip(bounds, (*sample[:-2], sample[-1])):
+                yield (
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} {count}'
+                )
+            yield f'{self.name}_sum{{{label_text}}} {sample[-2]}'
+            yield f'{self.name}_count{{{label_text}}} {sample[-1]}'
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = {}
+        self.histograms = {
+            'duration': Histogram(
+                'blogicum_request_duration_seconds',
+                'Время обработки запроса.', DURATION_BUCKETS
+            ),
+            'sql_time': Histogram(
+                'blogicum_request_sql_seconds',
+                'Суммарное время SQL-запросов за запрос.', DURATION_BUCKETS
+            ),
+            'render_time': Histogram(
+                'blogicum_request_render_seconds',
+                'Время отрисовки шаблонов за запрос.', DURATION_BUCKETS
+            ),
+            'queries': Histogram(
+                'blogicum_request_queries',
+                'Число SQL-запросов за запрос.', QUERY_BUCKETS
+            ),
+            'size': Histogram(
+                'blogicum_response_size_bytes',
+                'Размер тела ответа.', SIZE_BUCKETS
+            ),
+        }
+
+    def observe(self, view, status, metrics, size):
+        labels = (('view', view),)
+        with self.lock:
+            key = (('status', str(status)), *labels)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.histograms['duration'].observe(labels, metrics.total_time)
+            self.histograms['sql_time'].observe(labels, metrics.sql_time)
+            self.histograms['render_time'].observe(
+                labels, metrics.render_time
+            )
+            self.histograms['queries'].observe(labels, metrics.queries)
+            if size is not None:
+                self.histograms['size'].observe(labels, size)
+
+    def render(self):
+        with self.lock:
+            lines = [
+                '# HELP blogicum_requests_total Число обработанных запросов.',
+                '# TYPE blogicum_requests_total counter',
+            ]
+            lines += [
+                f'blogicum_requests_total{{{format_labels(labels)}}} {count}'
+                for labels, count in sorted(self.requests.items())
+            ]
+            for histogram in self.histograms.values():
+                lines += histogram.render()
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += perf_counter() - started
+
+    def server_timing(self):
+        return ', '.join((
+            f'sql;dur={self.sql_time * 1000:.2f};'
+            f'desc="{self.queries} queries"',
+            f'render;dur={self.render_time * 1000:.2f}',
+            f'total;dur={self.total_time * 1000:.2f}',
+        ))
+
+
+def track_render(response):
+    metrics = current_metrics.get()
+    started = perf_counter()
+    response.render()
+    if metrics is not None:
+        metrics.render_time += perf_counter() - started
+    return response
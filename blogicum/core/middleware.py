@@ -0,0 +1,60 @@
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REGISTRY, RequestMetrics, current_metrics, track_render
+from .nplusone import NPlusOneDetector
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+class RequestMetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        started = perf_counter()
+        try:
+            with wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        metrics.total_time = perf_counter() - started
+        response['Server-Timing'] = metrics.server_timing()
+        match = request.resolver_match
+        REGISTRY.observe(
+            match.view_name if match else 'unmatched',
+            response.status_code,
+            metrics,
+            None if response.streaming else len(response.content)
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        return track_render(response)
+
+
+class NPlusOneMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.NPLUSONE_THRESHOLD:
+            return self.get_response(request)
+        detector = NPlusOneDetector(settings.NPLUSONE_THRESHOLD)
+        with wrap_connections(detector):
+            response = self.get_response(request)
+        detector.report(request.get_full_path())
+        return response
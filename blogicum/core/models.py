@@ -1,4 +1,26 @@
 from django.db import models
+from django.utils import timezone
+
+from .signals import queryset_updated
+
+
+class PublishableQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        updated_at = kwargs.setdefault('updated_at', timezone.now())
+        rows = super().update(**kwargs)
+        if rows and queryset_updated.has_listeners(self.model):
+            queryset_updated.send(
+                sender=self.model,
+                queryset=self.model._base_manager.using(self.db).filter(
+                    updated_at=updated_at
+                ),
+                fields=frozenset(kwargs)
+            )
+        return rows
+
+    def changed_since(self, moment):
+        return self.filter(updated_at__gt=moment).order_by('updated_at', 'pk')
 
 
 class PublishableTimestampedModel(models.Model):
@@ -9,6 +31,18 @@ class PublishableTimestampedModel(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        default=timezone.now, editable=False, db_index=True,
+        verbose_name='Изменено'
+    )
+
+    objects = PublishableQuerySet.as_manager()
 
     class Meta:
         abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.updated_at = timezone.now()
+        if update_fields is not None:
+            update_fields = {*update_fields, 'updated_at'}
+        super().save(*args, update_fields=update_fields, **kwargs)
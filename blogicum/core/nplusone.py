@@ -0,0 +1,78 @@
+import logging
+import re
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.template.base import Node
+
+from . import metrics
+
+logger = logging.getLogger('blogicum.nplusone')
+
+INSTRUMENTATION_FILES = {__file__, metrics.__file__}
+
+PLACEHOLDER_LIST_RE = re.compile(r'\((?:\s*%s\s*,)*\s*%s\s*\)')
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def query_shape(sql):
+    return LITERAL_RE.sub('?', PLACEHOLDER_LIST_RE.sub('(...)', sql))
+
+
+def query_origin():
+    frame = sys._getframe(2)
+    project_frame = None
+    while frame is not None:
+        node = frame.f_locals.get('self')
+        if isinstance(node, Node) and getattr(node, 'token', None):
+            return f'{node.origin.template_name}:{node.token.lineno}'
+        filename = frame.f_code.co_filename
+        if (
+            project_frame is None
+            and filename.startswith(str(settings.BASE_DIR))
+            and 'site-packages' not in filename
+            and filename not in INSTRUMENTATION_FILES
+        ):
+            project_frame = f'{filename}:{frame.f_lineno}'
+        frame = frame.f_back
+    return project_frame or 'неизвестно'
+
+
+class NPlusOneDetector:
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() == 'SELECT':
+            shape = query_shape(sql)
+            self.counts[shape] += 1
+            if self.counts[shape] == self.threshold:
+                self.origins[shape] = query_origin()
+        return execute(sql, params, many, context)
+
+    @property
+    def repeated(self):
+        return [
+            (shape, self.counts[shape], origin)
+            for shape, origin in self.origins.items()
+        ]
+
+    def report(self, path):
+        repeated = self.repeated
+        if not repeated:
+            return
+        message = '\n'.join(
+            f'N+1 на {path}: {count} одинаковых запросов из {origin}: {shape}'
+            for shape, count, origin in repeated
+        )
+        if settings.NPLUSONE_RAISE:
+            raise NPlusOneError(message)
+        logger.warning(message)
@@ -0,0 +1,20 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'nplusone(threshold=None, allow=False): '
+        'настройка поиска N+1 запросов в тесте'
+    )
+
+
+@pytest.fixture(autouse=True)
+def nplusone(request, settings):
+    marker = request.node.get_closest_marker('nplusone')
+    settings.NPLUSONE_RAISE = True
+    if marker is not None:
+        if marker.kwargs.get('allow'):
+            settings.NPLUSONE_THRESHOLD = None
+        elif marker.kwargs.get('threshold'):
+            settings.NPLUSONE_THRESHOLD = marker.kwargs['threshold']
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import REGISTRY
+
+
+def metrics(request):
+    if not (
+        request.user.is_staff
+        or request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.render(), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,76 @@
+import pytest
+
+from blog.constants import API_POSTS_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_api_posts_pages_through_published_posts(
+        mixer, client, user, published_category
+):
+    posts = mixer.cycle(API_POSTS_PER_PAGE + 3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+
+    data = client.get("/api/posts/").json()
+    ids = [row["id"] for row in data["results"]]
+    assert len(ids) == API_POSTS_PER_PAGE
+    data = client.get(data["next"]).json()
+    ids += [row["id"] for row in data["results"]]
+
+    assert data["next"] is None
+    assert sorted(ids) == sorted(post.id for post in posts)
+
+
+@pytest.mark.django_db
+def test_api_posts_fields_and_filters(
+        client, post_with_published_location, post_of_another_author,
+        django_assert_max_num_queries
+):
+    post = post_with_published_location
+    with django_assert_max_num_queries(1):
+        response = client.get(
+            "/api/posts/",
+            {"author": post.author.username, "fields": "id,category"}
+        )
+    assert response.json()["results"] == [
+        {"id": post.id, "category": post.category.slug}
+    ]
+
+    response = client.get("/api/posts/", {"fields": "id,password"})
+    assert response.status_code == 400
+    response = client.get("/api/posts/", {"since": "not-a-date"})
+    assert response.status_code == 400
+    response = client.get("/api/posts/", {"since": "2999-01-01"})
+    assert response.json()["results"] == []
+
+
+@pytest.mark.django_db
+def test_api_posts_rejects_impossible_dates(client):
+    for value in ("2024-02-30", "2024-01-01T25:00:00"):
+        response = client.get("/api/posts/", {"since": value})
+        assert response.status_code == 400, (
+            "Убедитесь, что несуществующая дата в фильтре возвращает 400."
+        )
+        assert "since" in response.json()["errors"]
+
+
+@pytest.mark.django_db
+def test_api_posts_hides_unpublished_location(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    fields = {"fields": "id,location"}
+    results = client.get("/api/posts/", fields).json()["results"]
+    assert results == [{"id": post.id, "location": post.location.name}]
+
+    post.location.is_published = False
+    post.location.save()
+    results = client.get("/api/posts/", fields).json()["results"]
+    assert results == [{"id": post.id, "location": None}], (
+        "Убедитесь, что API не раскрывает название снятого с публикации"
+        " местоположения."
+    )
@@ -0,0 +1,100 @@
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from blog.models import Category, Post
+from blog.seed import BlogSeeder
+
+SIZES = [
+    int(size) for size in os.environ.get("BLOG_BENCHMARK", "").split(",")
+    if size.strip()
+]
+REPEAT = int(os.environ.get("BLOG_BENCHMARK_REPEAT", "20"))
+OUTPUT = Path(os.environ.get("BLOG_BENCHMARK_OUTPUT", "benchmark.json"))
+BASELINE = os.environ.get("BLOG_BENCHMARK_BASELINE")
+TOLERANCE = float(os.environ.get("BLOG_BENCHMARK_TOLERANCE", "1.5"))
+
+pytestmark = pytest.mark.skipif(
+    not SIZES, reason="Задайте BLOG_BENCHMARK для запуска замеров."
+)
+
+
+def view_urls():
+    post = Post.objects.order_by("-pub_date").first()
+    category = Category.objects.first()
+    return {
+        "homepage": "/",
+        "homepage_last": "/?page=last",
+        "category": f"/category/{category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "post_detail": f"/posts/{post.pk}/",
+    }
+
+
+def measure(client, url):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, url
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+        "queries": len(queries),
+    }
+
+
+def store(size, results):
+    data = json.loads(OUTPUT.read_text()) if OUTPUT.exists() else {}
+    data[str(size)] = results
+    OUTPUT.write_text(json.dumps(data, indent=2, sort_keys=True))
+
+
+def regressions(size, results):
+    baseline = json.loads(Path(BASELINE).read_text()).get(str(size), {})
+    found = []
+    for view, current in results.items():
+        previous = baseline.get(view)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * TOLERANCE:
+            found.append(
+                f"{view}: p95 {previous['p95_ms']} -> {current['p95_ms']} мс"
+            )
+        if current["queries"] > previous["queries"]:
+            found.append(
+                f"{view}: запросов {previous['queries']}"
+                f" -> {current['queries']}"
+            )
+    return found
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", SIZES)
+def test_view_latency(client, size):
+    users = max(size // 100, 10)
+    BlogSeeder(seed=size).seed(
+        users=users, categories=20, locations=50,
+        posts=size, comments=size * 2,
+    )
+    with override_settings(BLOG_PAGE_CACHE=False):
+        results = {
+            view: measure(client, url) for view, url in view_urls().items()
+        }
+    store(size, results)
+    if BASELINE:
+        found = regressions(size, results)
+        assert not found, "Производительность ухудшилась:\n" + "\n".join(
+            found
+        )
@@ -0,0 +1,29 @@
+import pytest
+from django.core.cache import cache
+
+from blog.pagination import CachedCountPaginator, feed_count_cache_key
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached_and_invalidated(
+        client, many_posts_with_published_locations
+):
+    client.get("/")
+    assert cache.get(feed_count_cache_key("index")) == N_PER_PAGE * 2
+
+    post = many_posts_with_published_locations[0]
+    post.is_published = False
+    post.save()
+    assert cache.get(feed_count_cache_key("index")) is None, (
+        "Убедитесь, что кэш количества публикаций сбрасывается при снятии"
+        " публикации."
+    )
+
+
+def test_page_range_is_windowed():
+    paginator = CachedCountPaginator(range(1000), N_PER_PAGE)
+    page_range = list(paginator.page(50).page_range)
+    assert paginator.ELLIPSIS in page_range
+    assert len(page_range) < 10
+    assert page_range[0] == 1 and page_range[-1] == 100
@@ -0,0 +1,37 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    mixer.blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев увеличивается при добавлении"
+        " комментария."
+    )
+
+    Comment.objects.filter(post=post).first().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении"
+        " комментария."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_fixes_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+
+    call_command("recount_comments")
+
+    post.refresh_from_db()
+    assert post.comment_count == 3
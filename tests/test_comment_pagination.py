@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from blog.constants import COMMENTS_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(mixer, client, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comment", post=post
+    )
+
+    response = client.get(f"/posts/{post.id}/")
+    content = response.content.decode("utf-8")
+    assert content.count('name="comment_') == COMMENTS_PER_PAGE, (
+        "Убедитесь, что на странице публикации выводится не больше"
+        f" {COMMENTS_PER_PAGE} комментариев."
+    )
+    cursor = re.search(r'\?comments=([\w-]+)', content).group(1)
+
+    data = client.get(
+        f"/posts/{post.id}/comments/", {"comments": cursor}
+    ).json()
+    assert data["next"] is None
+    shown = re.findall(r'name="comment_(\d+)"', data["html"])
+    assert shown == [str(c.id) for c in comments[COMMENTS_PER_PAGE:]]
+
+
+@pytest.mark.django_db
+def test_hidden_post_comments_not_available(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
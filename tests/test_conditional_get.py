@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Comment
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/posts/{id}/", "/api/{id}"])
+def test_post_revalidates_with_etag(
+        url, mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    url = url.format(id=post.id)
+    etag = client.get(url)["ETag"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившаяся публикация отдаётся с кодом 304."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_post_detail_has_no_etag_for_users(
+        user_client, post_with_published_location
+):
+    response = user_client.get(f"/posts/{post_with_published_location.id}/")
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/posts/{id}/", "/api/{id}"])
+def test_post_validators_do_not_depend_on_cache(
+        url, mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    url = url.format(id=post.id)
+    response = client.get(url)
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+
+    cache.clear()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что ETag вычисляется из данных публикации,"
+        " а не из состояния кэша."
+    )
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+    comment = mixer.blend("blog.Comment", post=post)
+    Comment.objects.filter(pk=comment.pk).update(
+        created_at=timezone.now() + timedelta(minutes=1)
+    )
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200
+    assert response["Last-Modified"] != last_modified
+
+
+@pytest.mark.django_db
+def test_post_etag_follows_comment_changes(
+        mixer, client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=another_user)
+    url = f"/posts/{post.id}/"
+
+    etag = client.get(url)["ETag"]
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что ETag меняется после редактирования комментария."
+    )
+    assert comment.text in response.content.decode()
+
+    etag = response["ETag"]
+    another_user.username = "renamed_commenter"
+    another_user.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "renamed_commenter" in response.content.decode()
@@ -0,0 +1,54 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+
+def _cursor_pages(client, url):
+    titles, cursor = [], None
+    while True:
+        response = client.get(url, {"cursor": cursor} if cursor else {})
+        assert response.status_code == 200
+        titles.extend(post.title for post in response.context["page_obj"])
+        content = response.content.decode("utf-8")
+        assert "?page=" not in content
+        match = re.search(r'\?cursor=([\w-]+)">\s*>>', content)
+        if not match:
+            return titles
+        cursor = match.group(1)
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_cursor_pagination_walks_all_posts(
+        url_name, client, many_posts_with_published_locations
+):
+    post = many_posts_with_published_locations[0]
+    url = {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[url_name]
+    expected = [
+        p.title for p in sorted(
+            many_posts_with_published_locations,
+            key=lambda p: (p.pub_date, p.pk), reverse=True
+        )
+    ]
+
+    titles = _cursor_pages(client, url)
+
+    assert len(expected) > N_PER_PAGE
+    assert titles == expected, (
+        "Убедитесь, что постраничная навигация по курсору возвращает все"
+        " публикации по одному разу и в порядке убывания даты."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_invalid_cursor_returns_404(client):
+    assert client.get("/", {"cursor": "broken"}).status_code == 404
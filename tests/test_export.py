@@ -0,0 +1,63 @@
+import gzip
+import json
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def posts_with_comments(mixer, user, many_posts_with_published_locations):
+    for post in many_posts_with_published_locations[:3]:
+        mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    return many_posts_with_published_locations
+
+
+def read_records(lines):
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+@pytest.mark.django_db
+def test_export_command_writes_ndjson(tmp_path, posts_with_comments):
+    output = tmp_path / "export.ndjson"
+    call_command("export_blog", output=str(output))
+    records = read_records(output.read_text(encoding="utf-8").splitlines())
+    assert [r["model"] for r in records] == (
+        ["blog.post"] * Post.objects.count()
+        + ["blog.comment"] * Comment.objects.count()
+    ), "Убедитесь, что команда `export_blog` выгружает посты и комментарии."
+    post = Post.objects.order_by("pk").first()
+    assert records[0]["pk"] == post.pk
+    assert records[0]["fields"]["title"] == post.title
+
+    gzipped = tmp_path / "export.ndjson.gz"
+    call_command(
+        "export_blog", output=str(gzipped), gzip=True, models=["comment"]
+    )
+    with gzip.open(gzipped, "rt", encoding="utf-8") as file:
+        assert read_records(file) == records[Post.objects.count():]
+
+
+@pytest.mark.django_db
+def test_export_endpoint_is_admin_only_and_streams(
+        admin_client, user_client, posts_with_comments
+):
+    assert user_client.get("/api/export/").status_code == 302, (
+        "Убедитесь, что выгрузка доступна только администраторам."
+    )
+    response = admin_client.get("/api/export/", {"models": "post"})
+    assert response.status_code == 200 and response.streaming
+    content = b"".join(response.streaming_content).decode()
+    records = read_records(content.splitlines())
+    assert len(records) == Post.objects.count()
+
+    response = admin_client.get(
+        "/api/export/", {"models": "post", "gzip": "1"}
+    )
+    assert response["Content-Type"] == "application/gzip"
+    compressed = b"".join(response.streaming_content)
+    assert gzip.decompress(compressed).decode() == content
+
+    response = admin_client.get("/api/export/", {"models": "user"})
+    assert response.status_code == 400
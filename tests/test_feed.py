@@ -0,0 +1,101 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import FeedEntry, Post
+
+
+@pytest.mark.django_db
+def test_homepage_reads_single_feed_table(
+        another_user_client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.get("/")
+    feed_queries = [
+        q["sql"] for q in queries.captured_queries
+        if "blog_feedentry" in q["sql"] and "LIMIT" in q["sql"]
+    ]
+    assert len(feed_queries) == 1
+    assert "JOIN" not in feed_queries[0], (
+        "Убедитесь, что лента главной страницы читается из одной таблицы."
+    )
+    assert all(
+        isinstance(post, Post) for post in response.context["page_obj"]
+    )
+
+
+@pytest.mark.django_db
+def test_feed_follows_post_and_category_changes(
+        post_with_published_location
+):
+    post = post_with_published_location
+    assert FeedEntry.objects.filter(post=post).exists()
+
+    post.category.is_published = False
+    post.category.save()
+    assert not FeedEntry.objects.filter(post=post).exists()
+
+    post.category.is_published = True
+    post.category.save()
+    Post.objects.filter(pk=post.pk).update(title="Новый заголовок")
+    assert FeedEntry.objects.get(post=post).title == "Новый заголовок"
+
+
+@pytest.mark.django_db
+def test_scheduled_post_is_promoted(post_with_published_location):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists()
+
+    later = timezone.now() + timedelta(days=2)
+    with mock.patch("django.utils.timezone.now", return_value=later):
+        call_command("publish_scheduled")
+    assert FeedEntry.objects.filter(post=post).exists(), (
+        "Убедитесь, что команда `publish_scheduled` добавляет в ленту"
+        " наступившие отложенные публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_updates_feed_counter_in_place(
+        mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert FeedEntry.objects.get(post=post).comment_count == 1
+    assert not any(
+        'DELETE FROM "blog_feedentry"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Новый комментарий не должен пересобирать запись ленты."
+    comment.delete()
+    assert FeedEntry.objects.get(post=post).comment_count == 0
+
+
+@pytest.mark.django_db
+def test_loaddata_fills_feed_in_any_order(tmp_path, mixer, user):
+    category = mixer.blend("blog.Category", is_published=True)
+    post = mixer.blend(
+        "blog.Post", author=user, category=category, location=None
+    )
+    records = json.loads(
+        serializers.serialize("json", [post, category, user])
+    )
+    Post.objects.all().delete()
+    category.delete()
+    user.delete()
+    fixture = tmp_path / "posts_first.json"
+    fixture.write_text(json.dumps(records), encoding="utf-8")
+    call_command("loaddata", str(fixture))
+    assert FeedEntry.objects.filter(post_id=post.pk).exists(), (
+        "Убедитесь, что лента заполняется при загрузке фикстуры,"
+        " даже если посты идут раньше авторов и категорий."
+    )
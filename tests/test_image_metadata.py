@@ -0,0 +1,75 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import ImageTask, PostImage
+
+
+def image_bytes(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def image_post(mixer, user, published_category):
+    def make(content, name="photo.jpg"):
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=None, image=ImageFile(BytesIO(content), name=name)
+        )
+    return make
+
+
+@pytest.mark.django_db
+def test_metadata_stored_on_upload(client, image_post):
+    content = image_bytes(300, 200)
+    post = image_post(content)
+    image_info = PostImage.objects.get(post=post)
+    assert (image_info.width, image_info.height) == (300, 200)
+    assert image_info.size == len(content)
+    assert image_info.sha256 == hashlib.sha256(content).hexdigest(), (
+        "Убедитесь, что при загрузке сохраняются размеры, вес и хеш"
+        " изображения."
+    )
+    for url in ("/", f"/posts/{post.pk}/"):
+        assert 'width="300" height="200"' in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_identical_upload_reuses_file(media_root, image_post):
+    content = image_bytes(300, 200)
+    first = image_post(content, "first.jpg")
+    call_command("process_image_tasks")
+    second = image_post(content, "second.jpg")
+    assert second.image.name == first.image.name, (
+        "Убедитесь, что повторная загрузка того же файла"
+        " использует уже сохранённое изображение."
+    )
+    assert not (media_root / "blog_images" / "second.jpg").exists()
+    call_command("process_image_tasks")
+    variants = PostImage.objects.get(post=first).variants
+    assert PostImage.objects.get(post=second).variants == variants
+
+    second.delete()
+    assert all(
+        (media_root / variant["name"]).exists() for variant in variants
+    ), "Убедитесь, что общие уменьшенные копии не удаляются."
+
+
+@pytest.mark.django_db
+def test_backfill_command(image_post):
+    post = image_post(image_bytes(120, 80))
+    PostImage.objects.all().delete()
+    ImageTask.objects.all().delete()
+    call_command("backfill_image_metadata")
+    image_info = PostImage.objects.get(post=post)
+    assert (image_info.width, image_info.height) == (120, 80)
+    assert image_info.sha256
+    assert ImageTask.objects.filter(post=post).exists()
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.constants import IMAGE_TASK_MAX_ATTEMPTS
+from blog.models import ImageTask, Post
+from blog.tasks import process_image_tasks
+
+
+def make_image_with_exif(name="photo.jpg"):
+    image = Image.new("RGB", (900, 600), color=(73, 109, 137))
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return ImageFile(buffer, name=name)
+
+
+@pytest.mark.django_db
+def test_upload_is_processed_by_worker(
+        client, media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, image=make_image_with_exif()
+    )
+    post = Post.objects.get(pk=post.pk)
+    assert post.image_status == "pending"
+    assert ImageTask.objects.filter(post=post).exists(), (
+        "Убедитесь, что загрузка изображения ставит задачу в очередь,"
+        " а не обрабатывает его во время запроса."
+    )
+    content = client.get(f"/posts/{post.pk}/").content.decode()
+    assert post.image.url in content and "srcset" not in content, (
+        "Убедитесь, что до обработки выводится исходное изображение."
+    )
+
+    call_command("process_image_tasks")
+    post = Post.objects.get(pk=post.pk)
+    assert post.image_status == "ready"
+    assert not ImageTask.objects.exists()
+    with Image.open(media_root / post.image.name) as image:
+        assert not image.getexif(), (
+            "Убедитесь, что обработчик удаляет EXIF из загруженного файла."
+        )
+    assert "srcset" in client.get(f"/posts/{post.pk}/").content.decode()
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_then_marked_failed(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=make_image_with_exif()
+    )
+    with mock.patch(
+            "blog.tasks.process_post_image", side_effect=OSError("boom")
+    ):
+        assert process_image_tasks() == (0, 1)
+        task = ImageTask.objects.get(post=post)
+        assert task.attempts == 1 and task.run_after > timezone.now(), (
+            "Убедитесь, что задача с ошибкой откладывается для повтора."
+        )
+        assert "boom" in task.last_error
+        assert process_image_tasks() == (0, 0)
+
+        for _ in range(IMAGE_TASK_MAX_ATTEMPTS - 1):
+            ImageTask.objects.update(run_after=timezone.now())
+            process_image_tasks()
+    task = ImageTask.objects.get(post=post)
+    assert task.attempts == IMAGE_TASK_MAX_ATTEMPTS
+    assert task.run_after is None
+    assert Post.objects.get(pk=post.pk).image_status == "failed"
+
+
+@pytest.mark.django_db
+def test_locked_task_is_not_claimed_twice(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=make_image_with_exif()
+    )
+    ImageTask.objects.filter(post=post).update(
+        locked_until=timezone.now() + timedelta(minutes=5)
+    )
+    assert process_image_tasks() == (0, 0)
+    assert Post.objects.get(pk=post.pk).image_status == "pending"
+
+
+@pytest.mark.django_db
+def test_metadata_is_stripped_without_recompression(
+        media_root, mixer, user, published_category
+):
+    image = Image.new("RGB", (900, 600), color=(73, 109, 137))
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    exif[0x0112] = 6
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif, quality=70)
+    original = buffer.getvalue()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, image=ImageFile(buffer, name="rotated.jpg")
+    )
+    call_command("process_image_tasks")
+
+    post = Post.objects.get(pk=post.pk)
+    cleaned = (media_root / post.image.name).read_bytes()
+    scan = original.index(b"\xff\xda")
+    assert cleaned.endswith(original[scan:]), (
+        "Убедитесь, что EXIF удаляется без перекодирования JPEG."
+    )
+    with Image.open(media_root / post.image.name) as stored:
+        assert dict(stored.getexif()) == {0x0112: 6}
+    assert (post.image_info.width, post.image_info.height) == (600, 900)
+
+
+@pytest.mark.django_db
+def test_png_metadata_is_stripped(
+        media_root, mixer, user, published_category
+):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    Image.new("RGB", (400, 300)).save(buffer, format="PNG", exif=exif)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, image=ImageFile(buffer, name="photo.png")
+    )
+    call_command("process_image_tasks")
+    post = Post.objects.get(pk=post.pk)
+    with Image.open(media_root / post.image.name) as stored:
+        assert not stored.getexif()
@@ -0,0 +1,70 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import FeedEntry, Post, PostImage
+
+
+def make_image(width, height, name="wide.jpg"):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return ImageFile(buffer, name=name)
+
+
+@pytest.mark.django_db
+def test_variants_generated_on_upload(
+        client, media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, image=make_image(1000, 500)
+    )
+    call_command("process_image_tasks")
+    variants = PostImage.objects.get(post=post).variants
+    assert {(v["width"], v["format"]) for v in variants} == {
+        (320, "webp"), (320, "jpeg"), (640, "webp"), (640, "jpeg"),
+    }, "Убедитесь, что при загрузке создаются уменьшенные копии изображения."
+    for variant in variants:
+        with Image.open(media_root / variant["name"]) as image:
+            assert image.width == variant["width"]
+            assert image.format == variant["format"].upper()
+
+    assert FeedEntry.objects.get(post=post).image_variants == variants
+    for url in ("/", f"/posts/{post.pk}/"):
+        content = client.get(url).content.decode()
+        assert 'type="image/webp"' in content and " 640w" in content, (
+            f"Убедитесь, что на странице `{url}` изображение выводится"
+            " с атрибутом srcset."
+        )
+
+
+@pytest.mark.django_db
+def test_variants_follow_image_changes(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=make_image(800, 800, "first.jpg")
+    )
+    call_command("process_image_tasks")
+    post.refresh_from_db()
+    old_names = [v["name"] for v in post.image_info.variants]
+    post.image = make_image(100, 50, "second.jpg")
+    post.save()
+    call_command("process_image_tasks")
+    post = Post.objects.get(pk=post.pk)
+    assert [(v["width"], v["format"]) for v in post.image_variants] == [
+        (100, "webp"), (100, "jpeg")
+    ]
+    assert not any((media_root / name).exists() for name in old_names), (
+        "Убедитесь, что уменьшенные копии старого изображения удаляются."
+    )
+
+    PostImage.objects.all().delete()
+    call_command("generate_image_variants")
+    assert Post.objects.get(pk=post.pk).image_variants
@@ -0,0 +1,128 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.backup import IMPORT_MODELS, import_records, iter_fixture_records
+from blog.models import Category, Comment, FeedEntry, Location, Post
+from blog.page_cache import get_tag_versions
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+IMPORTED_MODELS = (get_user_model(), Category, Location, Post, Comment)
+
+
+@pytest.fixture
+def blog_fixture():
+    records = [
+        record for record in json.loads(DB_JSON.read_text(encoding="utf-8"))
+        if record["model"] in IMPORT_MODELS
+    ]
+    post = next(r for r in records if r["model"] == "blog.post")
+    user = next(r for r in records if r["model"] == "auth.user")
+    records += [
+        {
+            "model": "blog.comment",
+            "pk": pk,
+            "fields": {
+                "post": post["pk"],
+                "author": user["pk"],
+                "text": f"Комментарий {pk}",
+                "created_at": "2023-01-01T00:00:00Z",
+            },
+        }
+        for pk in range(1, 6)
+    ]
+    records.sort(key=lambda r: r["model"] != "blog.comment")
+    return records
+
+
+def snapshot():
+    return {
+        model.__name__: list(model.objects.order_by("pk").values())
+        for model in IMPORTED_MODELS
+    } | {
+        "feed": list(FeedEntry.objects.values_list("post_id", flat=True)),
+    }
+
+
+def clear():
+    for model in reversed(IMPORTED_MODELS):
+        model.objects.all().delete()
+
+
+def strip_updated_at(state):
+    for rows in state.values():
+        for row in rows:
+            if isinstance(row, dict):
+                row.pop("updated_at", None)
+    return state
+
+
+@pytest.mark.django_db
+def test_import_matches_loaddata(tmp_path, blog_fixture):
+    fixture = tmp_path / "blog.json"
+    fixture.write_text(json.dumps(blog_fixture), encoding="utf-8")
+    call_command("loaddata", str(fixture))
+    call_command("recount_comments")
+    expected = strip_updated_at(snapshot())
+    assert expected["Post"] and expected["Comment"]
+    assert expected["feed"], "Опубликованные посты должны попасть в ленту."
+    counts = {post["id"]: post["comment_count"] for post in expected["Post"]}
+    assert counts[blog_fixture[0]["fields"]["post"]] == 5
+    clear()
+
+    call_command("import_blog", str(fixture), batch_size=7)
+    assert strip_updated_at(snapshot()) == expected, (
+        "Убедитесь, что `import_blog` загружает те же данные,"
+        " что и `loaddata`."
+    )
+
+    clear()
+    ndjson = tmp_path / "blog.ndjson.gz"
+    with gzip.open(ndjson, "wt", encoding="utf-8") as file:
+        for record in blog_fixture:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    call_command("import_blog", str(ndjson))
+    assert strip_updated_at(snapshot()) == expected
+
+
+@pytest.mark.django_db
+def test_import_refreshes_only_imported_posts(
+        user, published_category, post_with_published_location
+):
+    existing = FeedEntry.objects.get(post=post_with_published_location)
+    tag = "post:1000"
+    version = get_tag_versions([tag])[tag]
+    import_records([{
+        "model": "blog.post",
+        "pk": 1000,
+        "fields": {
+            "title": "Импортированный пост",
+            "text": "Текст",
+            "pub_date": "2023-01-01T00:00:00Z",
+            "author": user.pk,
+            "category": published_category.pk,
+            "created_at": "2023-01-01T00:00:00Z",
+        },
+    }])
+    assert FeedEntry.objects.filter(post_id=1000).exists()
+    assert FeedEntry.objects.filter(pk=existing.pk).exists(), (
+        "Убедитесь, что импорт обновляет ленту только для загруженных"
+        " постов, а не пересобирает её целиком."
+    )
+    assert get_tag_versions([tag])[tag] != version, (
+        "Убедитесь, что импорт сбрасывает кэш страниц загруженных постов."
+    )
+
+
+def test_fixture_parser_reads_in_small_chunks(tmp_path):
+    records = [{"model": "blog.category", "pk": i, "fields": {}}
+               for i in range(50)]
+    path = tmp_path / "array.json"
+    path.write_text(json.dumps(records, indent=2))
+    with path.open() as file:
+        assert list(iter_fixture_records(file, read_size=16)) == records
@@ -0,0 +1,33 @@
+import pytest
+
+from blog.mixins import PostsQuerySetMixin
+from blog.models import Comment
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("lookup", "index_name"),
+    [
+        ({}, "post_live_feed_idx"),
+        ({"author_id": 1}, "post_author_pub_date_idx"),
+        ({"category_id": 1}, "post_category_pub_date_idx"),
+    ],
+    ids=["homepage", "profile", "category"]
+)
+def test_feed_query_uses_index(lookup, index_name):
+    plan = PostsQuerySetMixin().get_filtered_queryset().filter(
+        **lookup
+    ).explain()
+    assert index_name in plan, (
+        f"Убедитесь, что запрос ленты публикаций использует индекс "
+        f"`{index_name}`. План запроса:\n{plan}"
+    )
+
+
+@pytest.mark.django_db
+def test_post_comments_query_uses_index():
+    plan = Comment.objects.filter(post_id=1).explain()
+    assert "comment_post_created_at_idx" in plan, (
+        "Убедитесь, что комментарии к публикации выбираются по индексу"
+        f" `comment_post_created_at_idx`. План запроса:\n{plan}"
+    )
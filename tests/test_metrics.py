@@ -0,0 +1,53 @@
+import re
+
+import pytest
+
+from core.metrics import REGISTRY
+
+
+@pytest.fixture
+def registry():
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+@pytest.mark.django_db
+def test_server_timing_header(client, many_posts_with_published_locations):
+    response = client.get("/")
+    header = response.get("Server-Timing", "")
+    match = re.search(r'sql;dur=[\d.]+;desc="(\d+) queries"', header)
+    assert match and int(match.group(1)) > 0, (
+        "Убедитесь, что ответ содержит заголовок `Server-Timing` "
+        "с числом и временем SQL-запросов."
+    )
+    assert re.search(r"render;dur=[\d.]+", header)
+    assert re.search(r"total;dur=[\d.]+", header)
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client, admin_client, registry,
+                          many_posts_with_published_locations):
+    client.get("/")
+    client.get("/")
+    response = admin_client.get("/metrics")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    text = response.content.decode()
+    assert (
+        'blogicum_requests_total{status="200",view="blog:index"} 2' in text
+    ), "Убедитесь, что `/metrics` считает запросы по представлениям."
+    assert 'blogicum_request_queries_count{view="blog:index"} 2' in text
+    assert re.search(
+        r'blogicum_request_duration_seconds_bucket'
+        r'\{view="blog:index",le="\+Inf"\} 2', text
+    )
+    assert 'blogicum_response_size_bytes_sum{view="blog:index"}' in text
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_private(client, registry):
+    response = client.get("/metrics", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == 403, (
+        "Убедитесь, что `/metrics` недоступна посторонним пользователям."
+    )
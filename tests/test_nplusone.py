@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from blog.mixins import PostsQuerySetMixin
+from core.nplusone import NPlusOneError, query_shape
+
+
+@pytest.fixture
+def without_select_related(monkeypatch):
+    original = PostsQuerySetMixin.get_base_queryset
+    monkeypatch.setattr(
+        PostsQuerySetMixin, "get_base_queryset",
+        lambda self: original(self).select_related(None)
+    )
+
+
+def test_query_shape_ignores_parameters():
+    assert query_shape(
+        'SELECT * FROM "blog_post" WHERE "id" IN (%s, %s, %s) LIMIT 21'
+    ) == query_shape(
+        'SELECT * FROM "blog_post" WHERE "id" IN (%s) LIMIT 5'
+    )
+    assert query_shape("SELECT 'a' WHERE x = 1") == "SELECT ? WHERE x = ?"
+
+
+@pytest.mark.django_db
+def test_nplusone_raises_in_tests(
+        user_client, user, without_select_related,
+        many_posts_with_published_locations
+):
+    with pytest.raises(NPlusOneError) as error:
+        user_client.get(f"/profile/{user.username}/")
+    assert "includes/post_card.html:" in str(error.value), (
+        "Убедитесь, что детектор N+1 указывает строку шаблона, "
+        "из которой пришли повторяющиеся запросы."
+    )
+
+
+@pytest.mark.django_db
+def test_nplusone_logs_in_production(
+        settings, caplog, user_client, user, without_select_related,
+        many_posts_with_published_locations
+):
+    settings.NPLUSONE_RAISE = False
+    with caplog.at_level(logging.WARNING, logger="blogicum.nplusone"):
+        response = user_client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    assert "includes/post_card.html:" in caplog.text
+
+
+@pytest.mark.django_db
+@pytest.mark.nplusone(allow=True)
+def test_nplusone_marker_disables_detector(
+        user_client, user, without_select_related,
+        many_posts_with_published_locations
+):
+    assert user_client.get(f"/profile/{user.username}/").status_code == 200
@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from blog.models import Category, Post
+from blog.page_cache import invalidate_pages, page_cache_stats
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_cached(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ("/", f"/posts/{post.id}/"):
+        assert client.get(url)["X-Page-Cache"] == "MISS"
+        assert client.get(url)["X-Page-Cache"] == "HIT", (
+            f"Убедитесь, что страница `{url}` кэшируется для анонимных"
+            " пользователей."
+        )
+    assert "X-Page-Cache" not in user_client.get("/")
+    assert page_cache_stats() == {"hits": 2, "misses": 2}
+
+
+@pytest.mark.django_db
+def test_page_cache_invalidated_on_changes(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    client.get(f"/posts/{post.id}/")
+
+    mixer.blend("blog.Comment", post=post, text="Новый комментарий")
+    assert client.get("/")["X-Page-Cache"] == "MISS"
+    response = client.get(f"/posts/{post.id}/")
+    assert "Новый комментарий" in response.content.decode("utf-8")
+
+    post.location.name = "Новое место"
+    post.location.save()
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert "Новое место" in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_page_cache_invalidated_on_queryset_updates(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get(f"/posts/{post.id}/")
+    Post.objects.filter(pk=post.pk).update(title="Новый заголовок")
+    response = client.get(f"/posts/{post.id}/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert "Новый заголовок" in response.content.decode("utf-8"), (
+        "Убедитесь, что массовое обновление публикаций сбрасывает кэш"
+        " страниц."
+    )
+
+    client.get("/")
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert "Новый заголовок" not in response.content.decode("utf-8"), (
+        "Убедитесь, что массовое снятие категории с публикации сбрасывает"
+        " кэш ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_page_cache_is_shared_between_processes(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    assert client.get(url)["X-Page-Cache"] == "HIT"
+
+    worker_cache = caches.create_connection("default")
+    assert not isinstance(worker_cache, LocMemCache), (
+        "Убедитесь, что кэш страниц общий для веб-процессов и фоновых"
+        " команд."
+    )
+    with mock.patch("blog.page_cache.cache", worker_cache):
+        invalidate_pages(f"post:{post.id}")
+    assert client.get(url)["X-Page-Cache"] == "MISS", (
+        "Убедитесь, что сброс кэша из фоновой команды виден веб-процессу."
+    )
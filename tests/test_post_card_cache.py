@@ -0,0 +1,61 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+
+from blog.page_cache import get_tag_versions
+
+
+@pytest.mark.django_db
+def test_post_card_fragment_follows_related_changes(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    post.author.username = "renamed_author"
+    post.author.save()
+
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Новая категория" in content and "@renamed_author" in content, (
+        "Убедитесь, что карточка публикации перерисовывается при изменении"
+        " категории или имени автора."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_cache_timeout_is_configurable(
+        settings, user_client, post_with_published_location
+):
+    settings.BLOG_POST_CARD_CACHE_TIMEOUT = 42
+    cache = caches["default"]
+    with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+        user_client.get("/")
+    timeouts = {
+        call.args[2] for call in cache_set.call_args_list
+        if call.args[0].startswith("template.cache.post_card.")
+    }
+    assert timeouts == {42}, (
+        "Убедитесь, что время кэширования карточки берётся из настройки"
+        " BLOG_POST_CARD_CACHE_TIMEOUT."
+    )
+
+
+@pytest.mark.django_db
+def test_login_does_not_invalidate_author_pages(
+        client, user, post_with_published_location
+):
+    tag = f"user:{user.pk}"
+    version = get_tag_versions([tag])[tag]
+    user.set_password("password")
+    user.save()
+    client.login(username=user.username, password="password")
+    assert get_tag_versions([tag])[tag] == version, (
+        "Убедитесь, что вход пользователя не сбрасывает кэш его страниц."
+    )
+
+    user.username = "renamed_author"
+    user.save()
+    assert get_tag_versions([tag])[tag] != version
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("client_name", ["user_client", "another_user_client"])
+def test_post_detail_query_count(
+        request, client_name, django_assert_num_queries, comment_to_a_post
+):
+    client = request.getfixturevalue(client_name)
+    post_id = comment_to_a_post.post_id
+    # session, user, post with its relations, comments with authors
+    with django_assert_num_queries(4):
+        response = client.get(f"/posts/{post_id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_hidden_post_detail_is_single_query_404(
+        another_user_client, django_assert_num_queries,
+        post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    with django_assert_num_queries(3):
+        response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("page", "expected_queries"),
+    [
+        # session, user, posts count, page of posts
+        ("index", 4),
+        # session, user, category, posts count, page of posts
+        ("category", 5),
+        # session, user, profile, posts count, page of posts
+        ("profile", 5),
+    ],
+)
+def test_post_list_query_count(
+        page, expected_queries, another_user_client,
+        django_assert_num_queries, many_posts_with_published_locations
+):
+    post = many_posts_with_published_locations[0]
+    url = {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[page]
+    with django_assert_num_queries(expected_queries):
+        response = another_user_client.get(url)
+    assert response.status_code == 200
+    with django_assert_num_queries(expected_queries - 1):
+        another_user_client.get(url)
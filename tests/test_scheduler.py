@@ -0,0 +1,63 @@
+import json
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.scheduler import publish_due_posts, seconds_until_next_publication
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+@pytest.mark.django_db
+def test_scheduled_post_becomes_visible_after_publication(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(hours=1)
+    post.save()
+    assert not Post.objects.get(pk=post.pk).is_live
+    assert client.get(f"/posts/{post.pk}/").status_code == 404
+    assert 0 < seconds_until_next_publication() <= 3600
+
+    later = timezone.now() + timedelta(hours=2)
+    with mock.patch("django.utils.timezone.now", return_value=later):
+        assert publish_due_posts() == (1, 0)
+    assert Post.objects.get(pk=post.pk).is_live
+    assert seconds_until_next_publication() is None
+    assert client.get(f"/posts/{post.pk}/").status_code == 200, (
+        "Убедитесь, что отложенный пост становится доступен после того,"
+        " как планировщик отметил его опубликованным."
+    )
+
+
+@pytest.mark.django_db
+def test_postponed_post_is_hidden(client, post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() + timedelta(days=1), is_live=True
+    )
+    assert publish_due_posts() == (0, 1)
+    assert client.get(f"/posts/{post.pk}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_loaddata_marks_past_posts_live(tmp_path, client):
+    records = [
+        record for record in json.loads(DB_JSON.read_text(encoding="utf-8"))
+        if record["model"] in ("auth.user", "blog.category", "blog.location",
+                               "blog.post")
+    ]
+    fixture = tmp_path / "db.json"
+    fixture.write_text(json.dumps(records), encoding="utf-8")
+    call_command("loaddata", str(fixture))
+    assert Post.objects.filter(is_live=True).count() == Post.objects.count()
+    response = client.get("/")
+    assert response.context["page_obj"].object_list, (
+        "Убедитесь, что после `loaddata` опубликованные посты из фикстуры"
+        " видны на главной странице."
+    )
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    pub_date = timezone.now() - timedelta(days=1)
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=pub_date, title=title, text=text, location=None
+        )
+        for title, text in (
+            ("Лошади в горах", "Рассказ о прогулке <b>верхом</b>."),
+            ("Город", "В городе не встретить ни одной лошади."),
+            ("Море", "Отпуск на побережье."),
+        )
+    ]
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_highlights(client, searchable_posts):
+    horses_title, horses_text, sea = searchable_posts
+    response = client.get("/search/", {"q": "лошадь"})
+    assert response.status_code == 200
+    found = list(response.context["page_obj"])
+    assert found == [horses_title, horses_text], (
+        "Убедитесь, что поиск находит словоформы запроса и ставит выше"
+        " посты, где совпадение есть в заголовке."
+    )
+    content = response.content.decode()
+    assert "<mark>лошади</mark>" in content, (
+        "Убедитесь, что совпадения во фрагменте текста выделяются."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, searchable_posts):
+    horses_title, horses_text, sea = searchable_posts
+    Post.objects.filter(pk=sea.pk).update(text="Лошадь на пляже.")
+    horses_text.is_published = False
+    horses_text.save()
+    horses_title.delete()
+    response = client.get("/search/", {"q": "лошадь"})
+    assert list(response.context["page_obj"]) == [sea], (
+        "Убедитесь, что поисковый индекс обновляется при изменении"
+        " и удалении постов, а скрытые посты не попадают в выдачу."
+    )
+
+
+@pytest.mark.django_db
+def test_search_escapes_text_and_query(client, searchable_posts):
+    response = client.get("/search/", {"q": 'верхом" *'})
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "&lt;b&gt;<mark>верхом</mark>" in content, (
+        "Убедитесь, что текст поста во фрагменте экранируется,"
+        " а служебные символы запроса не ломают поиск."
+    )
+    response = client.get("/search/", {"q": "  "})
+    assert response.context["page_obj"].paginator.count == 0
+
+
+@pytest.mark.django_db
+def test_admin_comment_search_uses_index(
+        admin_client, mixer, user, searchable_posts
+):
+    horses_title, horses_text, sea = searchable_posts
+    by_text = mixer.blend(
+        "blog.Comment", post=sea, author=user, text="Видел лошадей!"
+    )
+    by_post = mixer.blend(
+        "blog.Comment", post=horses_title, author=user, text="Красиво."
+    )
+    mixer.blend("blog.Comment", post=sea, author=user, text="Холодно.")
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(
+            "/admin/blog/comment/", {"q": "лошадь"}
+        )
+    assert response.status_code == 200
+    assert set(response.context["cl"].result_list) == {by_text, by_post}, (
+        "Убедитесь, что поиск комментариев в админке ищет по тексту"
+        " комментария и заголовку поста."
+    )
+    assert not any(
+        "LIKE" in query["sql"] for query in queries.captured_queries
+    ), "Убедитесь, что поиск в админке использует полнотекстовый индекс."
+
+
+@pytest.mark.django_db
+def test_search_renders_page_numbers(client, mixer, user, published_category):
+    mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1), title="Лошади",
+        text="Текст", location=None
+    )
+    content = client.get("/search/", {"q": "лошадь"}).content.decode()
+    assert 'href="?q=%D0%BB%D0%BE%D1%88%D0%B0%D0%B4%D1%8C&amp;page=2">2<' in (
+        content
+    ), "Убедитесь, что на странице поиска выводятся номера страниц."
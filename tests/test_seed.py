@@ -0,0 +1,33 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+
+from blog.models import Category, Comment, FeedEntry, Location, Post
+
+
+@pytest.mark.django_db
+def test_seed_blog_creates_visible_posts(client, django_user_model):
+    call_command(
+        "seed_blog", users=5, categories=2, locations=3, posts=40,
+        comments=100, seed=1
+    )
+    assert django_user_model.objects.count() == 5
+    assert Category.objects.count() == 2
+    assert Location.objects.count() == 3
+    assert Post.objects.count() == 40
+    assert Comment.objects.count() == 100
+    assert not Post.objects.annotate(actual=Count("comments")).exclude(
+        comment_count=F("actual")
+    ).exists(), "Убедитесь, что `seed_blog` заполняет счётчики комментариев."
+    assert FeedEntry.objects.count() == 40, (
+        "Убедитесь, что сгенерированные посты попадают в ленту."
+    )
+    feed_counts = FeedEntry.objects.values_list("post_id", "comment_count")
+    assert sorted(feed_counts) == sorted(
+        Post.objects.values_list("pk", "comment_count")
+    )
+    assert len(client.get("/").context["page_obj"]) == 10
+
+    call_command("seed_blog", users=0, categories=0, locations=0, posts=10,
+                 comments=0)
+    assert Post.objects.count() == 50
@@ -0,0 +1,141 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, ChangeEvent, Post
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag():
+    with mock.patch("blog.sync.SYNC_SAFETY_LAG", timedelta(0)):
+        yield
+
+
+def _sync(client, token=None):
+    response = client.get("/api/sync/", {"since": token} if token else {})
+    assert response.status_code == 200
+    return json.loads(b"".join(response.streaming_content))
+
+
+@pytest.mark.django_db
+def test_sync_returns_changes_since_token(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    data = _sync(client)
+    synced = {(c["model"], c["id"]) for c in data["changes"]}
+    assert ("post", post.id) in synced
+    assert ("category", post.category_id) in synced
+    assert not data["has_more"]
+
+    comment = mixer.blend("blog.Comment", post=post)
+    data = _sync(client, data["next"])
+    synced = {(c["model"], c["id"]): c for c in data["changes"]}
+    assert synced[("comment", comment.id)]["data"]["post"] == post.id
+    assert ("category", post.category_id) not in synced, (
+        "Убедитесь, что синхронизация возвращает только изменения после"
+        " переданного токена."
+    )
+
+    token, comment_id = data["next"], comment.id
+    comment.delete()
+    data = _sync(client, token)
+    assert {"model": "comment", "id": comment_id, "deleted": True} in (
+        data["changes"]
+    )
+
+
+@pytest.mark.django_db
+def test_sync_hides_unpublished_posts(client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    changes = _sync(client)["changes"]
+    assert {"model": "post", "id": post.id, "deleted": True} in changes
+
+
+@pytest.mark.django_db
+def test_sync_rejects_forged_token(client):
+    assert client.get("/api/sync/", {"since": "42"}).status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bulk", [False, True])
+def test_sync_sends_tombstones_for_hidden_children(
+        bulk, client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    token = _sync(client)["next"]
+
+    category = post.category
+    if bulk:
+        Category.objects.filter(pk=category.pk).update(is_published=False)
+    else:
+        category.is_published = False
+        category.save()
+    changes = _sync(client, token)["changes"]
+    for model, object_id in (("post", post.id), ("comment", comment.id)):
+        assert {"model": model, "id": object_id, "deleted": True} in (
+            changes
+        ), (
+            "Убедитесь, что при скрытии категории клиенты получают"
+            " удаление её постов и комментариев."
+        )
+
+    token = _sync(client, token)["next"]
+    Category.objects.filter(pk=category.pk).update(is_published=True)
+    synced = {(c["model"], c["id"]) for c in _sync(client, token)["changes"]
+              if not c["deleted"]}
+    assert {("post", post.id), ("comment", comment.id)} <= synced
+
+
+@pytest.mark.django_db
+def test_sync_sends_tombstones_for_comments_of_hidden_post(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    token = _sync(client)["next"]
+    post.is_published = False
+    post.save()
+    changes = _sync(client, token)["changes"]
+    assert {"model": "comment", "id": comment.id, "deleted": True} in changes
+
+
+@pytest.mark.django_db
+def test_queryset_update_does_not_preload_pks(
+        post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        Post.objects.filter(pk=post.pk).update(title="Новый заголовок")
+    assert queries.captured_queries[0]["sql"].startswith("UPDATE"), (
+        "Убедитесь, что `update()` не выбирает первичные ключи заранее."
+    )
+    assert ChangeEvent.objects.filter(
+        model_name="post", object_id=post.pk
+    ).count() == 2
+
+
+@pytest.mark.django_db
+def test_sync_waits_for_safety_lag(client, post_with_published_location):
+    token = _sync(client)["next"]
+    post = post_with_published_location
+    post.title = "Свежая правка"
+    post.save()
+    with mock.patch("blog.sync.SYNC_SAFETY_LAG", timedelta(seconds=5)):
+        data = _sync(client, token)
+        assert data == {"changes": [], "next": token, "has_more": False}, (
+            "Убедитесь, что синхронизация не отдаёт события моложе"
+            " SYNC_SAFETY_LAG и не сдвигает токен за них."
+        )
+        later = timezone.now() + timedelta(seconds=6)
+        with mock.patch("blog.sync.timezone.now", return_value=later):
+            changes = _sync(client, token)["changes"]
+    assert {(c["model"], c["id"]) for c in changes} == {("post", post.id)}
@@ -0,0 +1,23 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Category, Post
+
+
+@pytest.mark.django_db
+def test_updated_at_tracks_changes(post_with_published_location):
+    post = post_with_published_location
+    moment = timezone.now()
+    assert not Post.objects.changed_since(moment).exists()
+
+    post.title = "Новый заголовок"
+    post.save(update_fields=["title"])
+    assert list(Post.objects.changed_since(moment)) == [post], (
+        "Убедитесь, что `updated_at` обновляется при сохранении публикации."
+    )
+
+    moment = timezone.now()
+    Category.objects.filter(pk=post.category_id).update(is_published=False)
+    assert list(Category.objects.changed_since(moment)) == [post.category], (
+        "Убедитесь, что `updated_at` обновляется при `QuerySet.update()`."
+    )